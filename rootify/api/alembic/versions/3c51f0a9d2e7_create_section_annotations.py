@@ -0,0 +1,35 @@
+"""create section_annotations
+
+Revision ID: 3c51f0a9d2e7
+Revises: bdefb6b724cf
+Create Date: 2026-10-18 12:04:31.218406
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c51f0a9d2e7'
+down_revision: Union[str, None] = 'bdefb6b724cf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'section_annotations',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('text_hash', sa.String(length=64), nullable=False),
+        sa.Column('model_version', sa.String(length=255), nullable=False),
+        sa.Column('annotations', postgresql.JSONB(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.UniqueConstraint('text_hash', 'model_version', name='uq_section_annotations_text_hash_model_version'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('section_annotations')
@@ -0,0 +1,37 @@
+"""create evidence_pages
+
+Revision ID: 5d0b9e6f1a24
+Revises: 8a4e2d7c91b3
+Create Date: 2026-10-18 15:12:47.306195
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d0b9e6f1a24'
+down_revision: Union[str, None] = '8a4e2d7c91b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'evidence_pages',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('artist_id', sa.Integer(), sa.ForeignKey('artists.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('source', sa.Text(), nullable=False),
+        sa.Column('page_title', sa.Text(), nullable=False),
+        sa.Column('revid', sa.BigInteger(), nullable=True),
+        sa.Column('touched', sa.String(length=32), nullable=True),
+        sa.Column('fetched_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.Column('checked_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.UniqueConstraint('artist_id', 'source', name='uq_evidence_pages_artist_source'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('evidence_pages')
@@ -0,0 +1,34 @@
+"""add text_hash/extraction_version to evidence_sections and section_hash to evidence_claims
+
+Revision ID: 8a4e2d7c91b3
+Revises: 3c51f0a9d2e7
+Create Date: 2026-10-18 13:41:09.574112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4e2d7c91b3'
+down_revision: Union[str, None] = '3c51f0a9d2e7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("evidence_sections", sa.Column("text_hash", sa.String(length=64), nullable=True))
+    op.add_column("evidence_sections", sa.Column("extraction_version", sa.String(length=32), nullable=True))
+    op.add_column("evidence_claims", sa.Column("section_hash", sa.String(length=64), nullable=True))
+
+    # same sha256 hex digest the app computes, so existing sections diff cleanly on the next ingest.
+    # extraction_version stays NULL: existing claims carry no section_hash and get rebuilt once.
+    op.execute("UPDATE evidence_sections SET text_hash = encode(sha256(convert_to(text, 'UTF8')), 'hex')")
+
+
+def downgrade() -> None:
+    op.drop_column("evidence_claims", "section_hash")
+    op.drop_column("evidence_sections", "extraction_version")
+    op.drop_column("evidence_sections", "text_hash")
@@ -0,0 +1,35 @@
+"""create musicbrainz_cache
+
+Revision ID: b7e3c1d94f60
+Revises: 5d0b9e6f1a24
+Create Date: 2026-10-18 18:41:09.512377
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e3c1d94f60'
+down_revision: Union[str, None] = '5d0b9e6f1a24'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'musicbrainz_cache',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('kind', sa.String(length=8), nullable=False),
+        sa.Column('key', sa.Text(), nullable=False),
+        sa.Column('value', sa.Text(), nullable=True),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text("now()")),
+        sa.UniqueConstraint('kind', 'key', name='uq_musicbrainz_cache_kind_key'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('musicbrainz_cache')
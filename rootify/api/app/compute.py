@@ -0,0 +1,168 @@
+import asyncio
+import functools
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+# spaCy parsing (influence rules); 0 runs it on one thread of the API process instead
+COMPUTE_NLP_PROCESSES = int(os.getenv("COMPUTE_NLP_PROCESSES", "2"))
+# encoder + classifiers; torch already uses several threads per process and the
+# embedding cache assumes a single writer, so more than one process is rarely useful
+COMPUTE_ML_PROCESSES = int(os.getenv("COMPUTE_ML_PROCESSES", "1"))
+# blocking HTTP clients (youtube transcripts, boto3)
+COMPUTE_IO_THREADS = int(os.getenv("COMPUTE_IO_THREADS", "8"))
+
+
+def _init_nlp_worker() -> None:
+    from app.pipeline.nlp import get_nlp
+
+    get_nlp()
+
+
+def _init_ml_worker() -> None:
+    from app.pipeline.scoring.ml_scorer.wikipedia_scorer.registry import (
+        get_encoder,
+        get_stage1_meta,
+        get_stage1_model,
+        get_stage2_meta,
+        get_stage2_model,
+    )
+
+    get_encoder()
+    get_stage1_meta()
+    get_stage2_meta()
+    get_stage1_model()
+    get_stage2_model()
+
+
+class ComputePool:
+    """An executor plus the counters behind /admin/compute.
+
+    ``processes`` > 0 runs work in that many spawned worker processes, each
+    running ``initializer`` once so models are loaded before the first task.
+    ``processes`` == 0 falls back to a single thread in this process. For
+    thread pools pass ``threads`` instead.
+    """
+
+    def __init__(self, name: str, processes: int = 0, threads: int = 0, initializer=None) -> None:
+        self.name = name
+        self.initializer = initializer
+        if threads:
+            self.kind = "thread"
+            self.workers = threads
+        elif processes > 0:
+            self.kind = "process"
+            self.workers = processes
+        else:
+            self.kind = "thread"
+            self.workers = 1
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.in_flight = 0
+        self.max_queue_depth = 0
+
+    def _get_executor(self) -> Executor:
+        if self._executor is not None:
+            return self._executor
+        with self._lock:
+            if self._executor is None:
+                if self.kind == "process":
+                    # spawn, not fork: the API process may already hold torch/OpenMP threads
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=self.initializer,
+                    )
+                else:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix=f"compute-{self.name}",
+                    )
+            return self._executor
+
+    def queue_depth(self) -> int:
+        return max(0, self.in_flight - self.workers)
+
+    async def run(self, fn, *args, **kwargs):
+        executor = self._get_executor()
+        self.submitted += 1
+        self.in_flight += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth())
+        try:
+            result = await asyncio.get_running_loop().run_in_executor(
+                executor, functools.partial(fn, *args, **kwargs)
+            )
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            self.in_flight -= 1
+        self.completed += 1
+        return result
+
+    async def warm(self) -> None:
+        if self.initializer is None:
+            return
+        if self.kind == "process":
+            # one no-op per worker makes the executor spawn all of them (each runs the initializer)
+            await asyncio.gather(*(self.run(_noop) for _ in range(self.workers)))
+        else:
+            await self.run(self.initializer)
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "kind": self.kind,
+            "workers": self.workers,
+            "started": self._executor is not None,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth(),
+            "max_queue_depth": self.max_queue_depth,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+
+def _noop() -> None:
+    return None
+
+
+_nlp_pool = ComputePool("nlp", processes=COMPUTE_NLP_PROCESSES, initializer=_init_nlp_worker)
+_ml_pool = ComputePool("ml", processes=COMPUTE_ML_PROCESSES, initializer=_init_ml_worker)
+_io_pool = ComputePool("io", threads=max(1, COMPUTE_IO_THREADS))
+
+
+async def run_nlp(fn, *args, **kwargs):
+    return await _nlp_pool.run(fn, *args, **kwargs)
+
+
+async def run_ml(fn, *args, **kwargs):
+    return await _ml_pool.run(fn, *args, **kwargs)
+
+
+async def run_io(fn, *args, **kwargs):
+    return await _io_pool.run(fn, *args, **kwargs)
+
+
+async def start_compute() -> None:
+    await asyncio.gather(_nlp_pool.warm(), _ml_pool.warm())
+
+
+def shutdown_compute() -> None:
+    for pool in (_nlp_pool, _ml_pool, _io_pool):
+        pool.shutdown()
+
+
+def compute_stats() -> dict:
+    return {pool.name: pool.stats() for pool in (_nlp_pool, _ml_pool, _io_pool)}
@@ -9,14 +9,18 @@ from app.models import Artist
 from app.services.artists import create_artist, list_artists
 from app.services.evidence_sections import get_evidence_sections
 from app.pipeline.wiki_store import store_wikipedia_sections
+from app.pipeline.wiki_fetch import get_mediawiki_client
+from app.services.musicbrainz import cache_stats as musicbrainz_cache_stats, start_cache_sweeper, stop_cache_sweeper
 from app.pipeline.youtube_store import store_youtube_sections
-from app.pipeline.influence_rules import extract_influence_candidates 
+from app.pipeline.influence_rules import extract_influence_candidates_async, prefilter_stats
 from app.services.claims import extract_and_store_wikipedia_claims
 from app.services.claims import extract_and_store_wikidata_claims
 from app.services.claims import extract_and_store_youtube_claims
 from app.services.dataset_generator import generate_dataset_for_artist
 from app.services.influences import get_influences
-from app.pipeline.scoring.ml_scorer.wikipedia_scorer.registry import get_encoder, get_stage1_meta, get_stage2_meta, get_stage1_model, get_stage2_model
+from app.pipeline.scoring.ml_scorer.wikipedia_scorer.embedding_cache import flush_embedding_caches
+from app.pipeline.scoring.ml_scorer.wikipedia_scorer.two_stage_wikipedia_scorer import get_scoring_batcher, scorer_stats
+from app.compute import compute_stats, run_ml, shutdown_compute, start_compute
 
 # TEST ONLY
 from app.pipeline.candidates import extract_candidates
@@ -24,15 +28,18 @@ from app.pipeline.candidates import extract_candidates
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("Starting up...")
-    get_encoder("all-MiniLM-L6-v2")
-    get_stage1_meta()
-    get_stage2_meta()
-    get_stage1_model()
-    get_stage2_model()
+    # spawns the compute workers; each loads spaCy or the encoder/classifiers once
+    await start_compute()
+    start_cache_sweeper()
 
     yield
 
     print("Shutting down...")
+    await get_mediawiki_client().aclose()
+    await stop_cache_sweeper()
+    # the embedding store lives in the ml worker; sync its mapped files before it exits
+    await run_ml(flush_embedding_caches)
+    shutdown_compute()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -40,6 +47,28 @@ app = FastAPI(lifespan=lifespan)
 def health_check():
     return {"status": "healthy"}
 
+@app.get("/admin/models")
+async def read_model_stats():
+    stats = await run_ml(scorer_stats)
+    stats["scoring_batcher"] = get_scoring_batcher().stats()
+    return stats
+
+@app.get("/admin/compute")
+def read_compute_stats():
+    return compute_stats()
+
+@app.get("/admin/musicbrainz")
+def read_musicbrainz_stats():
+    return musicbrainz_cache_stats()
+
+@app.get("/admin/wiki")
+def read_wiki_stats():
+    return get_mediawiki_client().stats()
+
+@app.get("/admin/nlp")
+def read_nlp_stats():
+    return {"influence_prefilter": prefilter_stats()}
+
 @app.post("/admin/seed_artist_index")
 async def seed_artist_index(db: AsyncSession = Depends(get_db)):
     return await seed_artist_variants_index(db)
@@ -111,8 +140,8 @@ async def influence_candidates(
         db=db,
     )
     out = []
-    for sec in sections:
-        candidates = extract_influence_candidates(sec.text, sec.section_path)
+    items = [(sec.text, sec.section_path, None) for sec in sections]
+    for candidates in await extract_influence_candidates_async(items, db=db):
         out.extend(candidates)
     return out
 
@@ -1,5 +1,6 @@
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 from sqlalchemy import String, Boolean, DateTime, ForeignKey, Integer, Text, func
+from sqlalchemy.dialects.postgresql import JSONB
 from datetime import datetime
 import sqlalchemy as sa
 
@@ -28,10 +29,48 @@ class EvidenceSection(Base):
     keyword: Mapped[str] = mapped_column(Text, nullable=False)
     section_path: Mapped[str] = mapped_column(Text, nullable=False)
     text: Mapped[str] = mapped_column(Text, nullable=False)
+    text_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    # CURRENT_EXTRACTION_VERSION that produced this section's claims; None until extracted
+    extraction_version: Mapped[str | None] = mapped_column(String(32), nullable=True)
 
     is_fallback: Mapped[bool] = mapped_column(Boolean, nullable=False, server_default="false")
     created_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
 
+class EvidencePage(Base):
+    __tablename__ = "evidence_pages"
+    __table_args__ = (
+        sa.UniqueConstraint("artist_id", "source", name="uq_evidence_pages_artist_source"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    artist_id: Mapped[int] = mapped_column(ForeignKey("artists.id", ondelete="CASCADE"), nullable=False)
+    source: Mapped[str] = mapped_column(Text, nullable=False)
+    page_title: Mapped[str] = mapped_column(Text, nullable=False)
+    revid: Mapped[int | None] = mapped_column(sa.BigInteger, nullable=True)
+    touched: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    fetched_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=sa.text("now()"))
+    checked_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, server_default=sa.text("now()"))
+
+class SectionAnnotation(Base):
+    __tablename__ = "section_annotations"
+    __table_args__ = (
+        sa.UniqueConstraint(
+            "text_hash",
+            "model_version",
+            name="uq_section_annotations_text_hash_model_version",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    text_hash: Mapped[str] = mapped_column(String(64), nullable=False)
+    model_version: Mapped[str] = mapped_column(String(255), nullable=False)
+    annotations: Mapped[dict] = mapped_column(JSONB, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=sa.text("now()"),
+        nullable=False,
+    )
+
 class EvidenceClaim(Base):
     __tablename__ = "evidence_claims"
 
@@ -48,6 +87,7 @@ class EvidenceClaim(Base):
     pattern_type: Mapped[str] = mapped_column(nullable=False)
 
     section_path: Mapped[str] = mapped_column(nullable=False)
+    section_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     snippet: Mapped[str] = mapped_column(Text, nullable=False)
 
     created_at: Mapped[datetime] = mapped_column(
@@ -85,6 +125,25 @@ class ArtistNameVariant(Base):
         nullable=False,
     )
 
+class MusicBrainzCacheEntry(Base):
+    __tablename__ = "musicbrainz_cache"
+    __table_args__ = (
+        sa.UniqueConstraint("kind", "key", name="uq_musicbrainz_cache_kind_key"),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    # "name": normalized name -> mbid, "mbid": mbid -> canonical name
+    kind: Mapped[str] = mapped_column(String(8), nullable=False)
+    key: Mapped[str] = mapped_column(Text, nullable=False)
+    # None caches a negative result until expires_at
+    value: Mapped[str | None] = mapped_column(Text, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=sa.text("now()"),
+        nullable=False,
+    )
+
 # class InfluenceCandidate(Base):
 #     __tablename__ = "influence_candidates"
 #     artist_id: Mapped[int] = mapped_column(
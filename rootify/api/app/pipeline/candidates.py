@@ -1,16 +1,19 @@
+import os
 import re 
-import spacy
+from bisect import bisect_right
 
-from app.services.musicbrainz import fetch_mbid_cached, fetch_deduped_name_cached
+from app.pipeline.nlp_annotations import StoredDoc, text_hash
+from app.services.section_annotations import get_or_create_annotations
+from app.services.musicbrainz import fetch_deduped_names_cached, fetch_mbids_cached
 
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Tuple
+from typing import Dict, Iterator, List, Tuple
 from app.models import ArtistNameVariant
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-_nlp = spacy.load("en_core_web_sm")  
+CANDIDATES_NLP_PROFILE = os.getenv("CANDIDATES_NLP_PROFILE", "ner")
 
 @dataclass(frozen=True)
 class NameVariantEntry:
@@ -31,7 +34,68 @@ class ExtractedCandidate:
     match_form: str
     mbid: str
 
+class NameVariantTrie:
+    """Token trie over normalized name variants.
+
+    Each node is a dict keyed by token; the ``None`` key holds the entry that
+    terminates at that node. The first entry inserted for a token sequence
+    wins, mirroring the first-hit ``break`` of the old per-bucket scan.
+    """
+
+    def __init__(self) -> None:
+        self._root: dict = {}
+        self.size = 0
+        self.max_depth = 0
+
+    def add(self, entry: NameVariantEntry) -> None:
+        node = self._root
+        for tok in entry.tokens_norm:
+            node = node.setdefault(tok, {})
+        if None not in node:
+            node[None] = entry
+            self.size += 1
+            self.max_depth = max(self.max_depth, len(entry.tokens_norm))
+
+    def iter_longest_matches(self, doc_tokens: List[str]) -> Iterator[Tuple[int, int, NameVariantEntry]]:
+        """Yield ``(start, end, entry)`` for the longest variant starting at each token."""
+        root = self._root
+        num_tokens = len(doc_tokens)
+        for i in range(num_tokens):
+            node = root.get(doc_tokens[i])
+            if node is None:
+                continue
+            best = None
+            j = i + 1
+            while True:
+                entry = node.get(None)
+                if entry is not None:
+                    best = (j, entry)
+                if j >= num_tokens:
+                    break
+                node = node.get(doc_tokens[j])
+                if node is None:
+                    break
+                j += 1
+            if best is not None:
+                yield i, best[0], best[1]
+
+
+# Sentences either side of a mention used as its snippet; a negative value keeps the whole section.
+CONTEXT_SENTENCE_WINDOW = int(os.getenv("CONTEXT_SENTENCE_WINDOW", "0"))
+
+_SENT_BOUNDARY_RE = re.compile(r"(?<=[.!?])([\"')\]]*)\s+|\n+")
+_ABBREV_RE = re.compile(r"\b(?:dr|mr|mrs|ms|st|jr|sr|vs|feat|ft|no|vol|mt|lt|col|gen|prof)\.$", re.IGNORECASE)
+_INITIAL_RE = re.compile(r"\b[a-z]\.$", re.IGNORECASE)
+_NEXT_WORD_RE = re.compile(r"\s*(\w+)")
+# words that start a new sentence after "U.K." or "Malcolm X." rather than continue a name
+_SENTENCE_OPENERS = frozenset(
+    "a an and after as at but by during for from he her his however i in it its later many "
+    "most on she since some that the their then there these they this those when while with".split()
+)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
 _seed_index_cache: Dict[str, List[NameVariantEntry]] | None = None
+_seed_trie_cache: NameVariantTrie | None = None
 _seed_index_built_at: datetime | None = None
 _seed_index_ttl = timedelta(minutes=1440)
 
@@ -49,24 +113,7 @@ def _is_cache_fresh(now: datetime) -> bool:
         return False
     return (now - _seed_index_built_at) < _seed_index_ttl
 
-async def load_artist_name_variants(session: AsyncSession, force_rebuild: bool = False) -> dict[str, list[NameVariantEntry]]:
-    global _seed_index_cache, _seed_index_built_at
-
-    now = datetime.now(timezone.utc)
-    if not force_rebuild and _is_cache_fresh(now):
-        return _seed_index_cache  
-    
-    stmt = select(
-        ArtistNameVariant.canonical_name,
-        ArtistNameVariant.variant_norm,
-        ArtistNameVariant.first_token,
-        ArtistNameVariant.token_count,
-        ArtistNameVariant.char_len,
-        ArtistNameVariant.source,
-        ArtistNameVariant.match_form,
-    )
-
-    rows = (await session.execute(stmt)).all()
+def build_seed_index(rows) -> Dict[str, List[NameVariantEntry]]:
     index: Dict[str, List[NameVariantEntry]] = {}
     for canonical_name, variant_norm, first_token, token_count, char_len, source, match_form in rows:
         if not variant_norm:
@@ -93,72 +140,173 @@ async def load_artist_name_variants(session: AsyncSession, force_rebuild: bool =
     
     for ft, bucket in index.items():
         index[ft] = sorted(bucket, key=lambda e: (e.token_count, e.char_len), reverse=True)
+    return index
+
+def build_seed_trie(index: Dict[str, List[NameVariantEntry]]) -> NameVariantTrie:
+    trie = NameVariantTrie()
+    for ft, bucket in index.items():
+        for entry in bucket:
+            # the bucket scan only ever matched entries whose first token is the bucket key
+            if entry.tokens_norm[0] != ft:
+                continue
+            trie.add(entry)
+    return trie
+
+async def load_artist_name_variants(session: AsyncSession, force_rebuild: bool = False) -> dict[str, list[NameVariantEntry]]:
+    global _seed_index_cache, _seed_trie_cache, _seed_index_built_at
+
+    now = datetime.now(timezone.utc)
+    if not force_rebuild and _is_cache_fresh(now):
+        return _seed_index_cache  
+    
+    stmt = select(
+        ArtistNameVariant.canonical_name,
+        ArtistNameVariant.variant_norm,
+        ArtistNameVariant.first_token,
+        ArtistNameVariant.token_count,
+        ArtistNameVariant.char_len,
+        ArtistNameVariant.source,
+        ArtistNameVariant.match_form,
+    )
+
+    rows = (await session.execute(stmt)).all()
+    index = build_seed_index(rows)
     _seed_index_cache = index       
+    _seed_trie_cache = build_seed_trie(index)
     _seed_index_built_at = now
 
     return _seed_index_cache
 
+async def load_artist_name_trie(session: AsyncSession, force_rebuild: bool = False) -> NameVariantTrie:
+    await load_artist_name_variants(session, force_rebuild=force_rebuild)
+    return _seed_trie_cache
+
+def _is_abbreviation(text: str, start: int, m: re.Match) -> bool:
+    head = text[start:m.start()]
+    if _ABBREV_RE.search(head):
+        return True
+    if not _INITIAL_RE.search(head):
+        return False
+    next_word = _NEXT_WORD_RE.match(text, m.end())
+    return next_word is None or next_word.group(1).lower() not in _SENTENCE_OPENERS
+
+def split_sentence_spans(text: str) -> List[Tuple[int, int]]:
+    spans = []
+    start = 0
+    for m in _SENT_BOUNDARY_RE.finditer(text):
+        closers = m.group(1)
+        # "Dr. Dre", "St. Vincent" and initials are not sentence ends, but line breaks always are
+        if closers == "" and "\n" not in m.group(0) and _is_abbreviation(text, start, m):
+            continue
+        end = m.start() + len(closers or "")
+        if text[start:end].strip():
+            spans.append((start, end))
+        start = m.end()
+    if text[start:].strip():
+        spans.append((start, len(text)))
+    return spans
+
+def sentence_window(text: str, spans: List[Tuple[int, int]], k: int, window: int, k_end: int | None = None) -> str:
+    lo = max(0, k - window)
+    hi = min(len(spans) - 1, (k if k_end is None else k_end) + window)
+    return text[spans[lo][0]:spans[hi][1]].strip()
+
+def token_char_starts(text: str) -> List[int]:
+    """Start offset in ``text`` of each token of ``normalize_text(text).split()``."""
+    lowered = text.lower()
+    starts = [m.start() for m in _TOKEN_RE.finditer(lowered)]
+    if len(lowered) != len(text):
+        # a few characters lowercase to more than one, so map back char by char
+        origin = [i for i, c in enumerate(text) for _ in c.lower()]
+        starts = [origin[s] for s in starts]
+    return starts
+
+def match_seeded_variants(
+    trie: NameVariantTrie,
+    text: str,
+    spans: List[Tuple[int, int]] | None = None,
+    window: int = 0,
+) -> List[ExtractedCandidate]:
+    """Match seeded variants over the whole of ``text``.
+
+    With ``spans``, each match's snippet is the sentence window around it;
+    otherwise the snippet is ``text``. Matching never runs per sentence, so
+    names containing a split point ("Panic! at the Disco") still match.
+    """
+    doc_tokens = normalize_text(text).split()
+    starts = token_char_starts(text) if spans else None
+    out = []
+    for i, j, entry in trie.iter_longest_matches(doc_tokens):
+        if spans:
+            # a name spanning a split point gets every sentence it touches
+            k = max(0, bisect_right(spans, (starts[i], len(text))) - 1)
+            k_end = max(k, bisect_right(spans, (starts[j - 1], len(text))) - 1)
+            snippet = sentence_window(text, spans, k, window, k_end)
+        else:
+            snippet = text
+        out.append(
+            ExtractedCandidate(
+                influence_artist=entry.canonical_name,
+                mention_text=" ".join(doc_tokens[i:j]),
+                snippet=snippet,
+                candidate_method="string_match",
+                match_form=entry.match_form,
+                mbid=None,
+            )
+        )
+    return out
+
 async def extract_candidates(
     session: AsyncSession,
     text: str,
     include_ner: bool = False,
+    context_window: int = CONTEXT_SENTENCE_WINDOW,
 ) -> List[ExtractedCandidate]:
     # STRING MATCH
-    seeded_artist_variants = await load_artist_name_variants(session)
-    doc = normalize_text(text)
-    doc_tokens = doc.split()
-    num_tokens = len(doc_tokens)
-    out = []
-    for i in range(num_tokens):
-        bucket = seeded_artist_variants.get(doc_tokens[i])
-        if not bucket: continue
-
-        for entry in bucket:
-            k = entry.token_count
-            j = i + k
-            if j > num_tokens: continue
-            if tuple(doc_tokens[i:j]) == entry.tokens_norm:
-                out.append(
-                    ExtractedCandidate(
-                        influence_artist=entry.canonical_name,
-                        mention_text=" ".join(doc_tokens[i:j]),
-                        snippet=text,
-                        candidate_method="string_match",
-                        match_form=entry.match_form,
-                        mbid=None,
-                    )
-                )
-                break
+    seeded_artist_trie = await load_artist_name_trie(session)
+    spans = split_sentence_spans(text) if context_window >= 0 else None
+    out = match_seeded_variants(seeded_artist_trie, text, spans, context_window)
 
     # NER
     if include_ner:
-        ner_doc = _nlp(text)
+        annotations = await get_or_create_annotations(session, [text], CANDIDATES_NLP_PROFILE)
+        ner_doc = StoredDoc(text, annotations[text_hash(text)])
         for ent in ner_doc.ents:
             if ent.label_ not in  {"PERSON", "ORG"}:
                 continue
-            norm_ent = normalize_text(ent.text)
+            if spans:
+                k = max(0, bisect_right(spans, (ent.start_char, len(text))) - 1)
+                snippet = sentence_window(text, spans, k, context_window)
+            else:
+                snippet = text
             out.append(ExtractedCandidate(
                 influence_artist = None,
                 mention_text=ent.text,
-                snippet=text,
+                snippet=snippet,
                 candidate_method="ner",
                 match_form=None,
                 mbid=None,
             ))
 
-    #deduping
+    # resolve each distinct name once, concurrently, then dedup over the results
+    lookup_names = [
+        candidate.mention_text if candidate.candidate_method == "ner" else candidate.influence_artist
+        for candidate in out
+    ]
+    mbid_by_name = await fetch_mbids_cached(lookup_names, db=session)
+    canonical_by_mbid = await fetch_deduped_names_cached(list(mbid_by_name.values()), db=session)
+
+    # one candidate per artist per section: the first mention's window is its evidence,
+    # so repeated mentions neither multiply encoder inputs nor stack in the noisy-OR aggregate
     filtered_out = []
     seen = set()
-    for candidate in out:
-        if candidate.candidate_method == "ner":
-            mbid = await fetch_mbid_cached(candidate.mention_text)
-        else:
-            mbid = await fetch_mbid_cached(candidate.influence_artist)
+    for candidate, name in zip(out, lookup_names):
+        mbid = mbid_by_name.get(name)
         if mbid:
             if ("mbid", mbid) not in seen:
                 seen.add(("mbid", mbid))
                 new_candidate = ExtractedCandidate(
-                    influence_artist = await fetch_deduped_name_cached(mbid),
+                    influence_artist = canonical_by_mbid.get(mbid),
                     mbid = mbid,
                     mention_text = candidate.mention_text,
                     snippet = candidate.snippet,
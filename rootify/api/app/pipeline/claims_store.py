@@ -1,8 +1,24 @@
-from sqlalchemy import delete
+from sqlalchemy import delete, not_, or_, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.services.constants import CURRENT_EXTRACTION_VERSION
 from app.models import EvidenceClaim
 
+def _claim_rows(artist_id: int, source: str, claims: list[dict]) -> list[EvidenceClaim]:
+    return [
+        EvidenceClaim(
+            artist_id=artist_id,
+            source=source,
+            influence_artist=c["influence_artist"],
+            pattern_type=c["pattern_type"],
+            section_path=c["section_path"],
+            section_hash=c.get("section_hash"),
+            snippet=c["snippet"],
+            extraction_version=CURRENT_EXTRACTION_VERSION,
+            claim_probability=c["claim_probability"] if "claim_probability" in c else 1.0,
+        )
+        for c in claims
+    ]
+
 async def replace_claims_for_artist(db: AsyncSession, artist_id: int, source: str, claims: list[dict]):
     await db.execute(
         delete(EvidenceClaim).where(
@@ -11,20 +27,30 @@ async def replace_claims_for_artist(db: AsyncSession, artist_id: int, source: st
         )
     )
 
-    db.add_all(
-        [
-            EvidenceClaim(
-                artist_id=artist_id,
-                source=source,
-                influence_artist=c["influence_artist"],
-                pattern_type=c["pattern_type"],
-                section_path=c["section_path"],
-                snippet=c["snippet"],   
-                extraction_version=CURRENT_EXTRACTION_VERSION,
-                claim_probability=c["claim_probability"] if "claim_probability" in c else 1.0,
+    db.add_all(_claim_rows(artist_id, source, claims))
+
+    await db.commit()
+
+async def replace_claims_for_sections(
+    db: AsyncSession,
+    artist_id: int,
+    source: str,
+    kept_sections: list[tuple[str, str]],
+    claims: list[dict],
+):
+    """Keep claims whose (section_path, section_hash) is in ``kept_sections``; replace all others with ``claims``."""
+    await db.execute(
+        delete(EvidenceClaim)
+        .where(EvidenceClaim.artist_id == artist_id)
+        .where(EvidenceClaim.source == source)
+        .where(
+            or_(
+                EvidenceClaim.section_hash.is_(None),
+                not_(tuple_(EvidenceClaim.section_path, EvidenceClaim.section_hash).in_(kept_sections)),
             )
-            for c in claims
-        ]
+        )
     )
 
-    await db.commit()
\ No newline at end of file
+    db.add_all(_claim_rows(artist_id, source, claims))
+
+    await db.commit()
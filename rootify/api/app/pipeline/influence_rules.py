@@ -1,9 +1,21 @@
+import os
 import re
-import spacy
+from collections import deque
+from dataclasses import dataclass
 from pydantic import BaseModel
-from typing import Literal, Pattern
+from typing import Iterable, Iterator, Literal, NamedTuple, Pattern
 
-_nlp = spacy.load("en_core_web_sm")
+from app.compute import run_nlp
+from app.pipeline.nlp import parse, parse_many
+from app.pipeline.nlp_annotations import StoredDoc, text_hash
+from app.services.section_annotations import get_or_create_annotations
+
+INFLUENCE_NLP_PROFILE = os.getenv("INFLUENCE_NLP_PROFILE", "influence")
+
+INFLUENCE_NLP_BATCH_SIZE = int(os.getenv("INFLUENCE_NLP_BATCH_SIZE", "32"))
+INFLUENCE_NLP_N_PROCESS = int(os.getenv("INFLUENCE_NLP_N_PROCESS", "1"))
+# "0" parses whole sections instead of only their cue paragraphs (for regression comparisons)
+INFLUENCE_PARAGRAPH_PREFILTER = os.getenv("INFLUENCE_PARAGRAPH_PREFILTER", "1") == "1"
 
 PatternType = Literal["direct", "strong", "weak"]
 PatternDirection = Literal["after", "any"]
@@ -13,38 +25,67 @@ class InfluencePattern(BaseModel):
     label: PatternType
     direction: PatternDirection
     regex: Pattern[str]
-
+    # _CUE_WORDS entries of which the regex cannot match without at least one
+    cues: tuple[str, ...]
+    can_fallback: bool = True
+
+
+# Every PATTERN_SPECS regex needs one of these cue words to match; each spec names its own in ``cues``.
+# name -> (lowercase substrings, one of which must occur; regex confirming word boundaries, if any)
+_CUE_WORDS: dict[str, tuple[tuple[str, ...], str | None]] = {
+    "influenc": (("influenc",), None),
+    "inspir": (("inspir",), None),
+    "listening": (("listening",), None),
+    "like": (("like",), r"\blike"),
+    "draw": (("draw", "drew"), r"\bdr[ae]w"),
+    "lot_from": (("lot",), r"\blot\s+from"),
+    "ripoff": (("ripoff", "clone", "knockoff"), None),
+    "compar": (("compar",), None),
+    "remind": (("remind",), None),
+    "reminiscent": (("reminiscent",), None),
+    "style_of": (("style",), r"style\s+of"),
+}
+_CUE_RE = re.compile(
+    "|".join(rx or "|".join(map(re.escape, literals)) for literals, rx in _CUE_WORDS.values()),
+    re.IGNORECASE,
+)
 
 PATTERN_SPECS = [
     InfluencePattern(
         label="direct",
         direction="any",
+        cues=("influenc",),
         regex=re.compile(r"\b(?:really\s+)?influenced\s+(?:me|us|my|our)\b", re.IGNORECASE),
     ),
     InfluencePattern(
         label="direct",
         direction="any",
+        cues=("influenc",),
         regex=re.compile(r"\b(?:was|were)\s+(?:a\s+)?(?:huge|big|major|massive)\s+influence\b", re.IGNORECASE),
     ),
     InfluencePattern(
         label="direct",
         direction="any",
+        cues=("influenc",),
         regex=re.compile(r"\b(?:one\s+of\s+)?(?:my|our)\s+(?:biggest|main|primary)\s+influences?\b", re.IGNORECASE),
     ),
     InfluencePattern(
         label="direct",
         direction="after",
+        cues=("lot_from",),
         regex=re.compile(r"\b(?:take|took|taking)\s+(?:a\s+)?lot\s+from\b", re.IGNORECASE),
     ),
     InfluencePattern(
         label="direct",
         direction="after",
+        cues=("influenc",),
         regex=re.compile(r"\b(influenced\s+by)\b", re.IGNORECASE),
     ),
 
     InfluencePattern(
         label="direct",
         direction="after",
+        cues=("influenc",),
         regex=re.compile(
             r"\b(?:cited|cite|cites|named|list(?:ed)?)\s+(?:as\s+)?(?:his|her|their|its)\s+influences?\b"
             r"|\b(?:cited|cite|cites)\b(?!\s+(?:as\s+)?(?:an?\s+)?influence\s+by)(?!\s+as\s+an?\s+influence\s+by).*?\bas\s+(?:an?\s+)?influences?\b",
@@ -55,6 +96,7 @@ PATTERN_SPECS = [
     InfluencePattern(
         label="direct",
         direction="any",
+        cues=("influenc",),
         regex=re.compile(
             r"\b(named|listed)\b.*?\b(?:his|her|their)?\s*(?:biggest|primary|main)?\s*\w*\s*influences?\b",
             re.IGNORECASE,
@@ -63,47 +105,57 @@ PATTERN_SPECS = [
     InfluencePattern(
         label="direct",
         direction="any",
+        cues=("influenc",),
         regex=re.compile(r"\b(named|listed)\b.*?\bas an influence\b", re.IGNORECASE),
     ),
     InfluencePattern(
         label="direct",
         direction="after",
+        cues=("influenc",),
         regex=re.compile(r"\b(influences?\s+(include|have included)|other influences include)\b", re.IGNORECASE),
     ),
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("inspir",),
         regex=re.compile(r"\b(inspired\s+by)\b", re.IGNORECASE),
     ),
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("listening",),
         regex=re.compile(r"\bgrew\s+up\s+listening\s+to\b", re.IGNORECASE),
     ),
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("inspir",),
         regex=re.compile(r"\b(draws?|drawing)\s+inspiration\s+from\b", re.IGNORECASE),
     ),
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("like",),
         regex=re.compile(r"\b(?:music|artists|bands|acts)\s+like\b", re.IGNORECASE),
+        can_fallback=False,
     ),
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("like",),
         regex=re.compile(r"\b(?:spinning|playing)\s+(?:the\s+)?likes\s+of\b", re.IGNORECASE),
     ),
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("influenc",),
         regex=re.compile(r"\b(heavily\s+influenced\s+by)\b", re.IGNORECASE),
     ),
 
         InfluencePattern(
         label="strong",
         direction="after",
+        cues=("influenc",),
         regex=re.compile(
             r"\b(?:was|were|is|are)\s+influenced\s+by\b",
             re.IGNORECASE,
@@ -113,6 +165,7 @@ PATTERN_SPECS = [
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("draw",),
         regex=re.compile(
             r"\b(?:drew|draws|drawing)\s+(?:heavily\s+)?(?:from|on)\b",
             re.IGNORECASE,
@@ -122,6 +175,7 @@ PATTERN_SPECS = [
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("influenc",),
         regex=re.compile(
             r"\b(?:took|takes|taking)\s+(?:influence|influences)\s+from\b",
             re.IGNORECASE,
@@ -131,6 +185,7 @@ PATTERN_SPECS = [
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("influenc", "inspir"),
         regex=re.compile(
             r"\b(?:influences?|inspiration)\s+(?:range|ranged)\s+from\b",
             re.IGNORECASE,
@@ -140,6 +195,7 @@ PATTERN_SPECS = [
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("influenc",),
         regex=re.compile(
             r"\bthe\s+influence\s+of\b",
             re.IGNORECASE,
@@ -149,6 +205,7 @@ PATTERN_SPECS = [
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("inspir",),
         regex=re.compile(
             r"\b(?:was|were|is|are)\s+inspired\s+by\s+the\s+work\s+of\b",
             re.IGNORECASE,
@@ -158,6 +215,7 @@ PATTERN_SPECS = [
         InfluencePattern(
         label="strong",
         direction="after",
+        cues=("influenc",),
         regex=re.compile(
             r"\bwith\s+influence\s+from\b",
             re.IGNORECASE,
@@ -167,6 +225,7 @@ PATTERN_SPECS = [
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("influenc",),
         regex=re.compile(
             r"\bwith\s+influence\s+from\s+artists?\s+such\s+as\b",
             re.IGNORECASE,
@@ -176,6 +235,7 @@ PATTERN_SPECS = [
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("influenc",),
         regex=re.compile(
             r"\binfluenced\s+(?:prominently|notably|largely|mainly|partly)\s+by\b",
             re.IGNORECASE,
@@ -185,6 +245,7 @@ PATTERN_SPECS = [
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("influenc",),
         regex=re.compile(
             r"\b(?:was|were|is|are)\s+influenced\s+by\s+bands?\s+such\s+as\b",
             re.IGNORECASE,
@@ -194,6 +255,7 @@ PATTERN_SPECS = [
     InfluencePattern(
         label="strong",
         direction="after",
+        cues=("influenc",),
         regex=re.compile(
             r"\b(?:was|were|is|are)\s+influenced\s+by\s+artists?\s+such\s+as\b",
             re.IGNORECASE,
@@ -203,6 +265,7 @@ PATTERN_SPECS = [
     InfluencePattern(
         label="strong",
         direction="any",
+        cues=("ripoff",),
         regex=re.compile(
             r"\b(?:a|an)\s+[^.]{0,120}?\b(?:ripoff|clone|knockoff)\b",
             re.IGNORECASE,
@@ -212,6 +275,7 @@ PATTERN_SPECS = [
     InfluencePattern(
         label="weak",
         direction="after",
+        cues=("compar",),
         regex=re.compile(
             r"\b(?:people|they|critics)\s+(?:compare|compared)\s+(?:me|us|our\s+music|the\s+band)\s+to\b",
             re.IGNORECASE,
@@ -220,26 +284,31 @@ PATTERN_SPECS = [
     InfluencePattern(
         label="weak",
         direction="after",
+        cues=("remind",),
         regex=re.compile(r"\breminds?\s+me\s+of\b", re.IGNORECASE),
     ),
     InfluencePattern(
         label="weak",
         direction="after",
+        cues=("compar",),
         regex=re.compile(r"\b(compared\s+to)\b", re.IGNORECASE),
     ),
     InfluencePattern(
         label="weak",
         direction="after",
+        cues=("reminiscent",),
         regex=re.compile(r"\b(reminiscent\s+of)\b", re.IGNORECASE),
     ),
     InfluencePattern(
         label="weak",
         direction="after",
+        cues=("style_of",),
         regex=re.compile(r"\b(in\s+the\s+style\s+of)\b", re.IGNORECASE),
     ),
     InfluencePattern(
         label="weak",
         direction="after",
+        cues=("like",),
         regex=re.compile(r"\b(sounds?\s+like)\b", re.IGNORECASE),
     ),
 ]
@@ -268,6 +337,71 @@ _REVERSE_INFLUENCE = re.compile(
     re.IGNORECASE,
 )
 
+class InfluenceMatch(NamedTuple):
+    label: PatternType
+    direction: PatternDirection
+    start: int
+    end: int
+    can_fallback: bool
+
+
+class CompiledInfluenceMatcher:
+    """PATTERN_SPECS and the reverse-influence guard, dispatched on cue words.
+
+    ``cues`` replaces the sentence prefilter's ``_CUE_RE`` search and also says
+    which cue words are present; only specs whose cue is among them are
+    searched, in priority order, and the reverse guard only with its own
+    cue. A combined alternation of all specs benchmarked slower under
+    ``re``, since it loses each pattern's own prefix optimizations.
+    """
+
+    def __init__(self, specs: list[InfluencePattern], reverse: Pattern[str], reverse_cues: tuple[str, ...]) -> None:
+        for spec in specs:
+            unknown = set(spec.cues) - set(_CUE_WORDS)
+            if not spec.cues or unknown:
+                raise ValueError(f"pattern {spec.regex.pattern!r} has unknown or missing cues: {sorted(unknown)}")
+        self._cue_checks = [
+            (name, literals, re.compile(rx, re.IGNORECASE).search if rx else None)
+            for name, (literals, rx) in _CUE_WORDS.items()
+        ]
+        self._reverse = reverse
+        self._reverse_cues = frozenset(reverse_cues)
+        self._specs = [
+            (spec.regex.search, frozenset(spec.cues), spec.label, spec.direction, spec.can_fallback and spec.label != "weak")
+            for spec in specs
+        ]
+
+    def cues(self, sentence: str) -> set[str]:
+        """Names of the cue words in ``sentence``; empty exactly when ``_CUE_RE`` finds nothing."""
+        lowered = sentence.lower()
+        found = set()
+        for name, literals, confirm in self._cue_checks:
+            # plain substring tests first: far cheaper than scanning with a regex alternation
+            if any(lit in lowered for lit in literals) and (confirm is None or confirm(sentence)):
+                found.add(name)
+        return found
+
+    def match(self, sentence: str, cues: set[str] | None = None) -> InfluenceMatch | None:
+        """Return the highest-priority spec match, or None if nothing (or a reverse claim) matched."""
+        if cues is None:
+            cues = self.cues(sentence)
+        if not cues:
+            return None
+        if not self._reverse_cues.isdisjoint(cues) and self._reverse.search(sentence):
+            return None
+        for search, spec_cues, label, direction, can_fallback in self._specs:
+            if spec_cues.isdisjoint(cues):
+                continue
+            m = search(sentence)
+            if m:
+                return InfluenceMatch(label, direction, m.start(), m.end(), can_fallback)
+        return None
+
+
+# every branch of the reverse guard mentions influence/influenced/influential
+_MATCHER = CompiledInfluenceMatcher(PATTERN_SPECS, _REVERSE_INFLUENCE, ("influenc",))
+
+
 def _looks_like_artist_name(text: str) -> bool:
     t = text.strip()
     if not t:
@@ -409,46 +543,184 @@ def _org_is_just_descriptor(sentence: str, org_ent, sent_ents) -> bool:
     return False
 
 
+@dataclass(frozen=True)
+class _SentEnt:
+    text: str
+    label_: str
+    start_char: int
+    end_char: int
+
+
+def _sentence_ents(sent, offset: int) -> list[_SentEnt]:
+    # entity spans from the section-level parse, re-based onto the stripped sentence string
+    return [
+        _SentEnt(ent.text, ent.label_, ent.start_char - offset, ent.end_char - offset)
+        for ent in sent.ents
+    ]
+
+
+_SENT_END_RE = re.compile(r"[.!?](?:\s|$)")
+
+PREFILTER_STATS = {
+    "sections_seen": 0,
+    "sections_skipped": 0,
+    "chars_seen": 0,
+    "chars_parsed": 0,
+    "sentences_skipped_unparsed": 0,
+    "sentences_parsed": 0,
+    "sentences_skipped_no_cue": 0,
+}
+
+
+def prefilter_stats() -> dict:
+    return dict(PREFILTER_STATS)
+
+
+def _new_stats() -> dict:
+    return {k: 0 for k in PREFILTER_STATS}
+
+
+def _merge_stats(stats: dict) -> None:
+    for k, v in stats.items():
+        PREFILTER_STATS[k] += v
+
+
+def _cue_regions(text: str, stats: dict | None = None) -> list[str]:
+    """Group consecutive paragraphs that contain a cue word; paragraphs without one are dropped."""
+    stats = PREFILTER_STATS if stats is None else stats
+    regions = []
+    current = []
+    skipped_chars = 0
+    for para in text.split("\n"):
+        if not INFLUENCE_PARAGRAPH_PREFILTER or _CUE_RE.search(para):
+            current.append(para)
+            continue
+        if current:
+            regions.append("\n".join(current))
+            current = []
+        if para.strip():
+            skipped_chars += len(para)
+            # approximate: these sentences are never segmented
+            stats["sentences_skipped_unparsed"] += max(1, len(_SENT_END_RE.findall(para)))
+    if current:
+        regions.append("\n".join(current))
+
+    stats["sections_seen"] += 1
+    stats["chars_seen"] += len(text)
+    stats["chars_parsed"] += sum(len(r) for r in regions)
+    if not regions:
+        stats["sections_skipped"] += 1
+    return regions
+
+
 def extract_influence_candidates(text: str, section_path: str, subject_name: str | None = None):
-    doc = _nlp(text)
+    out = []
+    for region in _cue_regions(text):
+        out.extend(_extract_from_doc(parse(region, INFLUENCE_NLP_PROFILE), section_path, subject_name))
+    return out
+
+
+def extract_influence_candidates_batch(
+    items: Iterable[tuple[str, str, str | None]],
+    batch_size: int = INFLUENCE_NLP_BATCH_SIZE,
+    n_process: int = INFLUENCE_NLP_N_PROCESS,
+    stats: dict | None = None,
+) -> Iterator[list[dict]]:
+    """Yield extract_influence_candidates results for (text, section_path, subject_name) items, in order.
+
+    Cue regions from all items are streamed through one ``nlp.pipe`` so parsing
+    runs in batches and, with n_process > 1, across worker processes. Rule
+    matching still happens here on the returned Docs.
+    """
+    pending = deque()
+
+    def regions():
+        for i, (text, section_path, subject_name) in enumerate(items):
+            pending.append((i, section_path, subject_name, []))
+            for region in _cue_regions(text, stats):
+                yield region, i
+
+    docs = parse_many(
+        regions(), INFLUENCE_NLP_PROFILE, as_tuples=True, batch_size=batch_size, n_process=n_process
+    )
+    for doc, i in docs:
+        # items before i have had all their regions parsed
+        while pending[0][0] < i:
+            yield pending.popleft()[3]
+        _, section_path, subject_name, out = pending[0]
+        out.extend(_extract_from_doc(doc, section_path, subject_name, stats))
+    while pending:
+        yield pending.popleft()[3]
+
+
+def extract_influence_candidates_task(
+    items: list[tuple[str, str, str | None]],
+    annotations: dict[str, dict] | None = None,
+) -> tuple[list[list[dict]], dict]:
+    # compute-pool entry point: prefilter counters travel back with the results
+    # because the worker's PREFILTER_STATS is not the one /admin/nlp reads
+    stats = _new_stats()
+    if annotations is None:
+        return list(extract_influence_candidates_batch(items, n_process=1, stats=stats)), stats
+
+    results = []
+    for text, section_path, subject_name in items:
+        out = []
+        for region in _cue_regions(text, stats):
+            doc = StoredDoc(region, annotations[text_hash(region)])
+            out.extend(_extract_from_doc(doc, section_path, subject_name, stats))
+        results.append(out)
+    return results, stats
+
+
+async def extract_influence_candidates_async(
+    items: Iterable[tuple[str, str, str | None]],
+    db=None,
+) -> list[list[dict]]:
+    """Run the rules on the nlp pool. With ``db``, sentence/entity annotations are read from (and added to) section_annotations."""
+    items = list(items)
+    annotations = None
+    if db is not None:
+        regions = [region for text, _, _ in items for region in _cue_regions(text, _new_stats())]
+        annotations = await get_or_create_annotations(db, regions, INFLUENCE_NLP_PROFILE)
+    results, stats = await run_nlp(extract_influence_candidates_task, items, annotations)
+    _merge_stats(stats)
+    return results
+
+
+def _extract_from_doc(doc, section_path: str, subject_name: str | None = None, stats: dict | None = None):
+    stats = PREFILTER_STATS if stats is None else stats
     out = []
 
     for sent in doc.sents:
-        s = sent.text.strip()
+        raw = sent.text
+        s = raw.strip()
         if not s:
             continue
 
-        can_fallback = True
-        match = None
-        pattern_type = None
-        direction = None
-
-        if subject_name and _reverse_influenced_by_subject(s, subject_name):
+        stats["sentences_parsed"] += 1
+        cues = _MATCHER.cues(s)
+        if not cues:
+            stats["sentences_skipped_no_cue"] += 1
             continue
 
-        if _REVERSE_INFLUENCE.search(s):
+        match = _MATCHER.match(s, cues)
+        if not match:
             continue
 
-        for pat in PATTERN_SPECS:
-            match = pat.regex.search(s)
-            if match:
-                if match.re.pattern == r"\b(?:music|artists|bands|acts)\s+like\b":
-                    can_fallback = False
-                pattern_type = pat.label
-                if pattern_type == "weak":
-                    can_fallback = False
-                direction = pat.direction
-                break
-
-        if not match:
+        if subject_name and _reverse_influenced_by_subject(s, subject_name):
             continue
 
-        sent_doc = _nlp(s)
-        match_end = match.end()
-        match_start = match.start()
+        pattern_type = match.label
+        direction = match.direction
+        can_fallback = match.can_fallback
+
+        sent_ents = _sentence_ents(sent, sent.start_char + (len(raw) - len(raw.lstrip())))
+        match_end = match.end
+        match_start = match.start
 
         candidates = []
-        for ent in sent_doc.ents:
+        for ent in sent_ents:
             if ent.label_ not in {"PERSON", "ORG"}:
                 continue
             if ent.label_ == "ORG" and _is_labelish_org(ent.text):
@@ -456,7 +728,7 @@ def extract_influence_candidates(text: str, section_path: str, subject_name: str
 
             if direction == "after":
                 if ent.start_char >= match_end:
-                    if ent.label_ == "ORG" and _org_is_just_descriptor(s, ent, sent_doc.ents):
+                    if ent.label_ == "ORG" and _org_is_just_descriptor(s, ent, sent_ents):
                         continue
                     if _is_possessive_abstract_owner(s, ent.end_char):
                         continue
@@ -464,7 +736,7 @@ def extract_influence_candidates(text: str, section_path: str, subject_name: str
 
             elif direction == "any":
                 if ((ent.end_char <= match_end and match_start <= ent.start_char) or ent.start_char >= match_end):
-                    if ent.label_ == "ORG" and _org_is_just_descriptor(s, ent, sent_doc.ents):
+                    if ent.label_ == "ORG" and _org_is_just_descriptor(s, ent, sent_ents):
                         continue
                     if _is_possessive_abstract_owner(s, ent.end_char):
                         continue
@@ -0,0 +1,72 @@
+import os
+import threading
+from typing import Iterable
+
+import spacy
+
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+# Components each call-site profile skips. The model is loaded once with every
+# component available; a profile only decides which ones run for a given call.
+NLP_PROFILES: dict[str, tuple[str, ...]] = {
+    # the stock en_core_web_sm pipeline (senter ships disabled)
+    "full": ("senter",),
+    # influence rules read doc.sents and ents only; the parser still supplies sentence boundaries
+    "influence": ("senter", "tagger", "attribute_ruler", "lemmatizer"),
+    # as above with the statistical sentence recognizer standing in for the parser;
+    # faster, but boundaries can differ from the parser's
+    "influence-senter": ("parser", "tagger", "attribute_ruler", "lemmatizer"),
+    # entity spans only
+    "ner": ("senter", "parser", "tagger", "attribute_ruler", "lemmatizer"),
+}
+
+_nlp = None
+_nlp_lock = threading.Lock()
+_skip_cache: dict[str, list[str]] = {}
+
+
+def get_nlp():
+    """The process-wide spaCy pipeline, loaded on first use."""
+    global _nlp
+    if _nlp is not None:
+        return _nlp
+    with _nlp_lock:
+        if _nlp is None:
+            nlp = spacy.load(SPACY_MODEL)
+            if "senter" in nlp.disabled:
+                nlp.enable_pipe("senter")
+            _nlp = nlp
+    return _nlp
+
+
+def profile_disable(profile: str) -> list[str]:
+    """Component names to pass as ``disable=`` for ``profile``."""
+    cached = _skip_cache.get(profile)
+    if cached is not None:
+        return cached
+    if profile not in NLP_PROFILES:
+        raise ValueError(f"Unknown NLP profile: {profile}")
+
+    nlp = get_nlp()
+    skip = [name for name in NLP_PROFILES[profile] if name in nlp.pipe_names]
+    # a shared tok2vec is only worth running if something still listens to it
+    if "tok2vec" in nlp.pipe_names:
+        listeners = getattr(nlp.get_pipe("tok2vec"), "listening_components", None)
+        if listeners is not None and all(name in skip for name in listeners):
+            skip.append("tok2vec")
+    _skip_cache[profile] = skip
+    return skip
+
+
+def annotation_model_version(profile: str) -> str:
+    """Storage key for annotations produced by ``profile``; changes whenever the model package or profile does."""
+    version = spacy.util.get_package_version(SPACY_MODEL) or "unknown"
+    return f"{SPACY_MODEL}=={version}/{profile}"
+
+
+def parse(text: str, profile: str = "full"):
+    return get_nlp()(text, disable=profile_disable(profile))
+
+
+def parse_many(texts: Iterable, profile: str = "full", **pipe_kwargs):
+    return get_nlp().pipe(texts, disable=profile_disable(profile), **pipe_kwargs)
@@ -0,0 +1,54 @@
+import hashlib
+from dataclasses import dataclass
+
+from app.pipeline.nlp import parse_many
+
+# the rule engine and candidate extractor only ever look at these
+ANNOTATED_ENT_LABELS = {"PERSON", "ORG"}
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def doc_annotations(doc) -> dict:
+    """Sentence spans and PERSON/ORG entity spans of a parsed Doc, as JSON-friendly char offsets."""
+    sents = doc.sents if doc.has_annotation("SENT_START") else ()
+    return {
+        "sents": [[s.start_char, s.end_char] for s in sents],
+        "ents": [[e.start_char, e.end_char, e.label_] for e in doc.ents if e.label_ in ANNOTATED_ENT_LABELS],
+    }
+
+
+def annotate_texts(texts: list[str], profile: str, batch_size: int = 32) -> list[dict]:
+    return [doc_annotations(doc) for doc in parse_many(texts, profile, batch_size=batch_size)]
+
+
+@dataclass(frozen=True)
+class StoredEnt:
+    text: str
+    label_: str
+    start_char: int
+    end_char: int
+
+
+@dataclass(frozen=True)
+class StoredSent:
+    text: str
+    start_char: int
+    end_char: int
+    ents: tuple[StoredEnt, ...]
+
+
+class StoredDoc:
+    """Read-only stand-in for the parts of a spaCy Doc the pipeline uses: ``text``, ``sents`` and ``ents``."""
+
+    def __init__(self, text: str, annotations: dict) -> None:
+        self.text = text
+        self.ents = tuple(StoredEnt(text[s:e], label, s, e) for s, e, label in annotations.get("ents", ()))
+        sents = []
+        for s, e in annotations.get("sents", ()):
+            # same containment rule as Span.ents
+            ents = tuple(ent for ent in self.ents if ent.start_char >= s and ent.end_char <= e)
+            sents.append(StoredSent(text[s:e], s, e, ents))
+        self.sents = tuple(sents)
@@ -0,0 +1,113 @@
+from collections import deque
+import asyncio
+import anyio
+
+_HIST_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+class MicroBatcher:
+    """Coalesce items submitted by concurrent callers into batched calls of ``fn``.
+
+    ``fn`` is synchronous, takes a list of items and returns one result per
+    item in the same order. ``run(fn, items)`` awaits it off the event loop;
+    by default in a worker thread. A batch is flushed once ``max_batch_size`` items are pending or
+    ``max_wait_ms`` has passed since the first pending item was seen.
+    """
+
+    def __init__(self, fn, max_batch_size: int, max_wait_ms: float, run=None) -> None:
+        self._fn = fn
+        self._run_fn = run or anyio.to_thread.run_sync
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms / 1000.0)
+
+        self._pending: deque = deque()
+        self._has_items: asyncio.Event | None = None
+        self._full: asyncio.Event | None = None
+        self._worker: asyncio.Task | None = None
+
+        self.batches = 0
+        self.items = 0
+        self.max_queue_depth = 0
+        self.batch_size_hist = {b: 0 for b in _HIST_BUCKETS}
+        self.batch_size_hist["inf"] = 0
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._has_items = asyncio.Event()
+            self._full = asyncio.Event()
+            if self._pending:
+                self._has_items.set()
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def submit_many(self, items: list) -> list:
+        if not items:
+            return []
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        futs = []
+        for item in items:
+            fut = loop.create_future()
+            self._pending.append((item, fut))
+            futs.append(fut)
+        self.max_queue_depth = max(self.max_queue_depth, len(self._pending))
+        self._has_items.set()
+        if len(self._pending) >= self.max_batch_size:
+            self._full.set()
+        return list(await asyncio.gather(*futs))
+
+    def _record(self, size: int) -> None:
+        self.batches += 1
+        self.items += size
+        for b in _HIST_BUCKETS:
+            if size <= b:
+                self.batch_size_hist[b] += 1
+                return
+        self.batch_size_hist["inf"] += 1
+
+    def _take_batch(self) -> list:
+        n = min(len(self._pending), self.max_batch_size)
+        batch = [self._pending.popleft() for _ in range(n)]
+        if len(self._pending) < self.max_batch_size:
+            self._full.clear()
+        if not self._pending:
+            self._has_items.clear()
+        return batch
+
+    async def _run(self) -> None:
+        while True:
+            await self._has_items.wait()
+            if len(self._pending) < self.max_batch_size and self.max_wait > 0:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.max_wait)
+                except asyncio.TimeoutError:
+                    pass
+
+            batch = self._take_batch()
+            if not batch:
+                continue
+            self._record(len(batch))
+
+            try:
+                results = await self._run_fn(self._fn, [item for item, _ in batch])
+                if len(results) != len(batch):
+                    raise RuntimeError("batched function returned wrong number of results")
+            except Exception as exc:
+                for _, fut in batch:
+                    if not fut.done():
+                        fut.set_exception(exc)
+                continue
+
+            for (_, fut), result in zip(batch, results):
+                if not fut.done():
+                    fut.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": len(self._pending),
+            "max_queue_depth": self.max_queue_depth,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            "batches": self.batches,
+            "items": self.items,
+            "batch_size_hist": {str(k): v for k, v in self.batch_size_hist.items()},
+        }
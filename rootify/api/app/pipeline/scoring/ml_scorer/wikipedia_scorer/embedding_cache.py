@@ -0,0 +1,200 @@
+from collections import OrderedDict
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import numpy as np
+
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR")
+EMBEDDING_CACHE_MAX_MB = float(os.getenv("EMBEDDING_CACHE_MAX_MB", "256"))
+
+logger = logging.getLogger(__name__)
+
+_UNSAFE_PATH_CHARS = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# per row: sha256 of the text (all zero when free) and the tick of its last use
+_SLOT_DTYPE = np.dtype([("key", np.uint8, 32), ("tick", "<i8")])
+
+
+class MmapEmbeddingStore:
+    """Fixed-capacity float32 embedding store backed by memory-mapped files.
+
+    Rows live in ``vectors.f32``; ``slots.bin`` holds each row's text hash and
+    last-use tick, so a put only writes the rows it touches. LRU order is
+    rebuilt from the ticks on open. When the store is full the least recently
+    used slot is reused.
+
+    Each process keeps its own slot map, so only one process may use a
+    directory: opening takes an exclusive ``flock`` on ``.lock`` and raises
+    ``BlockingIOError`` when another process holds it.
+    """
+
+    def __init__(self, path: str, dim: int, max_bytes: int) -> None:
+        self.dim = dim
+        self.capacity = max(1, int(max_bytes // (dim * 4)))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(path, exist_ok=True)
+        # held until the process exits; the kernel drops it if the process dies
+        self._lock_fd = os.open(os.path.join(path, ".lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(self._lock_fd)
+            raise
+        self._vec_path = os.path.join(path, "vectors.f32")
+        self._slots_path = os.path.join(path, "slots.bin")
+        self._meta_path = os.path.join(path, "meta.json")
+        self._lock = threading.Lock()
+        self._slots: OrderedDict[str, int] = OrderedDict()
+
+        mode = "r+" if self._layout_matches() else "w+"
+        self._mm = np.memmap(self._vec_path, dtype=np.float32, mode=mode, shape=(self.capacity, dim))
+        self._slot_table = np.memmap(self._slots_path, dtype=_SLOT_DTYPE, mode=mode, shape=(self.capacity,))
+        if mode == "w+":
+            with open(self._meta_path, "w") as f:
+                json.dump({"dim": self.dim, "capacity": self.capacity}, f)
+
+        ticks = self._slot_table["tick"]
+        used = np.flatnonzero(ticks)
+        for slot in used[np.argsort(ticks[used], kind="stable")]:
+            self._slots[self._slot_table["key"][slot].tobytes().hex()] = int(slot)
+        self._tick = int(ticks.max()) if len(used) else 0
+        used_set = set(self._slots.values())
+        self._free = [s for s in range(self.capacity - 1, -1, -1) if s not in used_set]
+
+    def _layout_matches(self) -> bool:
+        try:
+            with open(self._meta_path, "r") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if meta.get("dim") != self.dim or meta.get("capacity") != self.capacity:
+            return False
+        return (
+            os.path.exists(self._vec_path)
+            and os.path.getsize(self._vec_path) == self.capacity * self.dim * 4
+            and os.path.exists(self._slots_path)
+            and os.path.getsize(self._slots_path) == self.capacity * _SLOT_DTYPE.itemsize
+        )
+
+    def _touch(self, slot: int) -> None:
+        self._tick += 1
+        self._slot_table["tick"][slot] = self._tick
+
+    def get_many(self, keys: list[str]) -> dict[str, np.ndarray]:
+        out = {}
+        with self._lock:
+            for key in keys:
+                slot = self._slots.get(key)
+                if slot is None:
+                    self.misses += 1
+                    continue
+                self._slots.move_to_end(key)
+                self._touch(slot)
+                out[key] = np.array(self._mm[slot])
+                self.hits += 1
+        return out
+
+    def put_many(self, keys: list[str], vectors: np.ndarray) -> None:
+        # writes land in the page cache of the shared mappings and survive a
+        # worker crash; flush() forces them to disk
+        with self._lock:
+            for key, vec in zip(keys, vectors):
+                if key in self._slots:
+                    self._slots.move_to_end(key)
+                    self._touch(self._slots[key])
+                    continue
+                if self._free:
+                    slot = self._free.pop()
+                else:
+                    _, slot = self._slots.popitem(last=False)
+                    self.evictions += 1
+                    # free the slot before overwriting its row, so a kill mid-write
+                    # never leaves the old key pointing at the new vector
+                    self._slot_table["tick"][slot] = 0
+                    self._slot_table["key"][slot] = 0
+                self._mm[slot] = vec
+                self._slot_table["key"][slot] = np.frombuffer(bytes.fromhex(key), dtype=np.uint8)
+                self._touch(slot)
+                self._slots[key] = slot
+
+    def flush(self) -> None:
+        with self._lock:
+            self._mm.flush()
+            self._slot_table.flush()
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._slots),
+            "capacity": self.capacity,
+            "dim": self.dim,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+# None marks a directory another process holds; this process then encodes uncached
+_stores: dict[str, MmapEmbeddingStore | None] = {}
+_stores_lock = threading.Lock()
+
+
+def _get_store(encoder_name: str, dim: int) -> MmapEmbeddingStore | None:
+    if encoder_name in _stores:
+        return _stores[encoder_name]
+    with _stores_lock:
+        if encoder_name not in _stores:
+            path = os.path.join(EMBEDDING_CACHE_DIR, _UNSAFE_PATH_CHARS.sub("_", encoder_name))
+            try:
+                _stores[encoder_name] = MmapEmbeddingStore(path, dim, int(EMBEDDING_CACHE_MAX_MB * 1024 * 1024))
+            except BlockingIOError:
+                logger.warning("embedding cache %s is locked by another process; encoding uncached", path)
+                _stores[encoder_name] = None
+        return _stores[encoder_name]
+
+
+def encode_cached(encoder, encoder_name: str, texts, batch_size: int) -> np.ndarray:
+    if not EMBEDDING_CACHE_DIR or len(texts) == 0:
+        return encoder.encode(texts, batch_size=batch_size, show_progress_bar=False)
+
+    store = _get_store(encoder_name, encoder.get_sentence_embedding_dimension())
+    if store is None:
+        return encoder.encode(texts, batch_size=batch_size, show_progress_bar=False)
+    keys = [text_key(t) for t in texts]
+    found = store.get_many(keys)
+
+    missing: dict[str, str] = {}
+    for key, text in zip(keys, texts):
+        if key not in found and key not in missing:
+            missing[key] = text
+
+    if missing:
+        vectors = np.asarray(
+            encoder.encode(list(missing.values()), batch_size=batch_size, show_progress_bar=False),
+            dtype=np.float32,
+        )
+        store.put_many(list(missing.keys()), vectors)
+        found.update(zip(missing.keys(), vectors))
+
+    return np.stack([found[k] for k in keys])
+
+
+def flush_embedding_caches() -> None:
+    for store in list(_stores.values()):
+        if store is not None:
+            store.flush()
+
+
+def embedding_cache_stats() -> dict:
+    return {name: store.stats() for name, store in _stores.items() if store is not None}
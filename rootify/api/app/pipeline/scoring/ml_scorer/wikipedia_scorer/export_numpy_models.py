@@ -0,0 +1,24 @@
+import json
+import joblib
+import numpy as np
+from numpy_logreg import NumpyLogReg, export_npz
+
+STAGES = [
+    ("logreg_minilm_c10", "T_junk", "X_test.npy"),
+    ("logreg_direction_pair_c100", "T_choice", "direction_checker/X_test.npy"),
+]
+
+for stem, threshold_key, x_path in STAGES:
+    with open(f"{stem}.meta.json", "r") as f:
+        meta = json.load(f)
+    clf = joblib.load(f"{stem}.joblib")
+    export_npz(clf, f"{stem}.npz", meta[threshold_key])
+    print("saved", f"{stem}.npz")
+
+    X = np.load(x_path)
+    ref = clf.predict_proba(X)
+    got = NumpyLogReg.load(f"{stem}.npz").predict_proba(X)
+    max_err = float(np.max(np.abs(ref - got)))
+    print(f"{stem}: {X.shape[0]} rows, max |predict_proba diff| = {max_err:.3e}")
+    if max_err > 1e-6:
+        raise SystemExit(f"{stem}: numpy scorer does not match sklearn")
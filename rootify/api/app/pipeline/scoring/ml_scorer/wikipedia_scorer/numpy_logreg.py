@@ -0,0 +1,49 @@
+import numpy as np
+
+
+class NumpyLogReg:
+    """Binary logistic regression scorer loaded from an exported ``.npz``.
+
+    Mirrors ``LogisticRegression.predict_proba`` for two classes without
+    importing sklearn at runtime.
+    """
+
+    def __init__(self, coef: np.ndarray, intercept: np.ndarray, classes: np.ndarray, threshold: float) -> None:
+        self.coef_ = np.ascontiguousarray(coef, dtype=np.float64).reshape(-1)
+        self.intercept_ = float(np.asarray(intercept, dtype=np.float64).reshape(-1)[0])
+        self.classes_ = np.asarray(classes)
+        self.threshold = float(threshold)
+
+    @classmethod
+    def load(cls, path: str) -> "NumpyLogReg":
+        with np.load(path) as data:
+            return cls(data["coef"], data["intercept"], data["classes"], data["threshold"])
+
+    def decision_function(self, X) -> np.ndarray:
+        return np.asarray(X, dtype=np.float64) @ self.coef_ + self.intercept_
+
+    def predict_positive(self, X) -> np.ndarray:
+        z = self.decision_function(X)
+        # numerically stable sigmoid
+        out = np.empty_like(z)
+        pos = z >= 0
+        out[pos] = 1.0 / (1.0 + np.exp(-z[pos]))
+        ez = np.exp(z[~pos])
+        out[~pos] = ez / (1.0 + ez)
+        return out
+
+    def predict_proba(self, X) -> np.ndarray:
+        p = self.predict_positive(X)
+        return np.stack([1.0 - p, p], axis=1)
+
+
+def export_npz(clf, path: str, threshold: float) -> None:
+    if clf.coef_.shape[0] != 1:
+        raise ValueError("Only binary logistic regression models can be exported")
+    np.savez(
+        path,
+        coef=clf.coef_.astype(np.float64),
+        intercept=clf.intercept_.astype(np.float64),
+        classes=clf.classes_,
+        threshold=np.float64(threshold),
+    )
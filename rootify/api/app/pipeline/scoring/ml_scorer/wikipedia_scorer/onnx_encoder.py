@@ -0,0 +1,142 @@
+import json
+import os
+import numpy as np
+
+_HERE = os.path.dirname(__file__)
+
+ONNX_MODEL_DIR = os.getenv("ONNX_MODEL_DIR", os.path.join(_HERE, "onnx"))
+
+# all-MiniLM-L6-v2 is Transformer -> mean pooling -> L2 normalize with a 256 token window
+DEFAULT_MAX_SEQ_LENGTH = 256
+
+
+def _model_dir(name: str) -> str:
+    return os.path.join(ONNX_MODEL_DIR, name)
+
+
+def onnx_model_path(name: str, quantize: bool) -> str:
+    return os.path.join(_model_dir(name), "model.int8.onnx" if quantize else "model.onnx")
+
+
+def export_onnx_encoder(name: str, quantize: bool = False) -> str:
+    """Export a SentenceTransformer's transformer module to ONNX (optionally int8).
+
+    Needs torch, sentence-transformers and onnx; only run once per model.
+    """
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    out_dir = _model_dir(name)
+    os.makedirs(out_dir, exist_ok=True)
+    fp32_path = onnx_model_path(name, quantize=False)
+
+    if not os.path.exists(fp32_path):
+        st = SentenceTransformer(name, device="cpu")
+        hf_model = st[0].auto_model.eval()
+        tokenizer = st.tokenizer
+        dummy = tokenizer(["export"], return_tensors="pt")
+        torch.onnx.export(
+            hf_model,
+            (dummy["input_ids"], dummy["attention_mask"], dummy["token_type_ids"]),
+            fp32_path,
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": {0: "batch", 1: "seq"},
+                "attention_mask": {0: "batch", 1: "seq"},
+                "token_type_ids": {0: "batch", 1: "seq"},
+                "last_hidden_state": {0: "batch", 1: "seq"},
+            },
+            opset_version=14,
+        )
+        tokenizer.save_pretrained(out_dir)
+        with open(os.path.join(out_dir, "encoder.meta.json"), "w") as f:
+            json.dump(
+                {
+                    "encoder": name,
+                    "embedding_dim": st.get_sentence_embedding_dimension(),
+                    "max_seq_length": st.max_seq_length,
+                    "normalize": True,
+                },
+                f,
+                indent=2,
+            )
+
+    if not quantize:
+        return fp32_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    int8_path = onnx_model_path(name, quantize=True)
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    return int8_path
+
+
+class OnnxSentenceEncoder:
+    """onnxruntime drop-in for the ``SentenceTransformer.encode`` calls the scorer makes."""
+
+    def __init__(self, name: str, quantize: bool = False, intra_op_threads: int | None = None) -> None:
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        path = onnx_model_path(name, quantize)
+        if not os.path.exists(path):
+            path = export_onnx_encoder(name, quantize=quantize)
+
+        model_dir = _model_dir(name)
+        meta_path = os.path.join(model_dir, "encoder.meta.json")
+        meta = {}
+        if os.path.exists(meta_path):
+            with open(meta_path, "r") as f:
+                meta = json.load(f)
+
+        self.name = name
+        self.model_path = path
+        self.quantize = quantize
+        self.max_seq_length = int(meta.get("max_seq_length", DEFAULT_MAX_SEQ_LENGTH))
+        self.normalize = bool(meta.get("normalize", True))
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            opts.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(path, sess_options=opts, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        self._dim = int(meta.get("embedding_dim", self.session.get_outputs()[0].shape[-1]))
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self._dim
+
+    def _encode_batch(self, texts) -> np.ndarray:
+        enc = self.tokenizer(
+            list(texts),
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors="np",
+        )
+        feeds = {k: v.astype(np.int64) for k, v in enc.items() if k in self._input_names}
+        hidden = self.session.run(None, feeds)[0]
+
+        mask = enc["attention_mask"][..., None].astype(np.float32)
+        summed = (hidden * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        emb = summed / counts
+        if self.normalize:
+            emb = emb / np.clip(np.linalg.norm(emb, axis=1, keepdims=True), 1e-12, None)
+        return emb.astype(np.float32)
+
+    def encode(self, texts, batch_size: int = 32, show_progress_bar: bool = False, **kwargs) -> np.ndarray:
+        if isinstance(texts, str):
+            return self._encode_batch([texts])[0]
+        texts = list(texts)
+        if not texts:
+            return np.zeros((0, self._dim), dtype=np.float32)
+        # sort by length so each padded batch wastes as little compute as possible
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        out = np.empty((len(texts), self._dim), dtype=np.float32)
+        for start in range(0, len(order), batch_size):
+            idx = order[start : start + batch_size]
+            out[idx] = self._encode_batch([texts[i] for i in idx])
+        return out
@@ -1,38 +1,176 @@
-from functools import lru_cache
-from sentence_transformers import SentenceTransformer
+from dataclasses import dataclass, asdict
+from typing import TYPE_CHECKING
 import json
-import joblib
 import os
+import threading
+import time
+from .numpy_logreg import NumpyLogReg
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
 
 _HERE = os.path.dirname(__file__)
 
+DEFAULT_ENCODER = "all-MiniLM-L6-v2"
+DEFAULT_ENCODER_VERSION = "main"
+
+# torch | onnx | onnx-int8
+ENCODER_BACKEND = os.getenv("ENCODER_BACKEND", "torch")
+ENCODER_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+STAGE1_ARTIFACT = "logreg_minilm_c10"
+STAGE2_ARTIFACT = "logreg_direction_pair_c100"
+
+_ENCODER_PREFIXES = ("sentence-transformers/",)
+
+
+@dataclass
+class ModelStats:
+    kind: str
+    name: str
+    version: str
+    load_seconds: float
+    approx_bytes: int
+    loaded_at: float
+    hits: int = 0
+
+
+def canonical_encoder_name(name: str | None) -> str:
+    n = (name or DEFAULT_ENCODER).strip()
+    for prefix in _ENCODER_PREFIXES:
+        if n.startswith(prefix):
+            n = n[len(prefix):]
+    return n
+
+
+def _approx_nbytes(obj) -> int:
+    model_path = getattr(obj, "model_path", None)
+    if model_path:
+        return os.path.getsize(model_path)
+    parameters = getattr(obj, "parameters", None)
+    if callable(parameters):
+        return sum(p.numel() * p.element_size() for p in parameters())
+    total = 0
+    for attr in ("coef_", "intercept_", "classes_"):
+        arr = getattr(obj, attr, None)
+        total += getattr(arr, "nbytes", 0)
+    return total
+
+
+class ModelRegistry:
+    """Process-wide store of loaded models keyed by (kind, canonical name, version).
+
+    Every model stays resident once loaded, so callers that ask for the same
+    weights under different spellings share one instance.
+    """
+
+    def __init__(self) -> None:
+        self._models: dict[tuple[str, str, str], object] = {}
+        self._stats: dict[tuple[str, str, str], ModelStats] = {}
+        self._lock = threading.Lock()
+
+    def get(self, kind: str, name: str, version: str, loader):
+        key = (kind, name, version)
+        model = self._models.get(key)
+        if model is not None:
+            self._stats[key].hits += 1
+            return model
+        with self._lock:
+            model = self._models.get(key)
+            if model is not None:
+                self._stats[key].hits += 1
+                return model
+            t0 = time.perf_counter()
+            model = loader()
+            load_seconds = time.perf_counter() - t0
+            self._models[key] = model
+            self._stats[key] = ModelStats(
+                kind=kind,
+                name=name,
+                version=version,
+                load_seconds=load_seconds,
+                approx_bytes=_approx_nbytes(model),
+                loaded_at=time.time(),
+            )
+            return model
+
+    def is_loaded(self, kind: str, name: str, version: str) -> bool:
+        return (kind, name, version) in self._models
+
+    def stats(self) -> list[dict]:
+        return [asdict(s) for s in self._stats.values()]
+
 
-@lru_cache(maxsize=1)
-def get_encoder(name: str = "all-MiniLM-L6-v2") -> SentenceTransformer:
-    return SentenceTransformer(name)
+_registry = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    return _registry
 
 
 def _data_path(name: str) -> str:
     return os.path.join(_HERE, name)
 
 
-@lru_cache(maxsize=1)
-def get_stage1_meta():
-    with open(_data_path("logreg_minilm_c10.meta.json"), "r") as f:
+def _load_json(path: str):
+    with open(path, "r") as f:
         return json.load(f)
 
 
-@lru_cache(maxsize=1)
+def _load_encoder(name: str, version: str, backend: str):
+    if backend == "torch":
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(name, revision=None if version == DEFAULT_ENCODER_VERSION else version)
+    from .onnx_encoder import OnnxSentenceEncoder
+    return OnnxSentenceEncoder(name, quantize=(backend == "onnx-int8"))
+
+
+def get_encoder(
+    name: str | None = None,
+    version: str = DEFAULT_ENCODER_VERSION,
+    backend: str | None = None,
+) -> "SentenceTransformer":
+    canon = canonical_encoder_name(name)
+    backend = backend or ENCODER_BACKEND
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend: {backend}")
+    return _registry.get(
+        "encoder",
+        canon,
+        f"{version}+{backend}",
+        lambda: _load_encoder(canon, version, backend),
+    )
+
+
+def encoder_cache_name(name: str | None = None, backend: str | None = None) -> str:
+    # embeddings from different backends drift slightly, so they are cached separately
+    return f"{canonical_encoder_name(name)}+{backend or ENCODER_BACKEND}"
+
+
+def get_stage1_meta():
+    return _registry.get("meta", "stage1", STAGE1_ARTIFACT, lambda: _load_json(_data_path(f"{STAGE1_ARTIFACT}.meta.json")))
+
+
 def get_stage2_meta():
-    with open(_data_path("logreg_direction_pair_c100.meta.json"), "r") as f:
-        return json.load(f)
+    return _registry.get("meta", "stage2", STAGE2_ARTIFACT, lambda: _load_json(_data_path(f"{STAGE2_ARTIFACT}.meta.json")))
+
+
+def _load_classifier(stem: str):
+    # The exported .npz keeps sklearn out of the API process; the joblib pickle is the fallback.
+    npz_path = _data_path(f"{stem}.npz")
+    if os.path.exists(npz_path):
+        return NumpyLogReg.load(npz_path)
+    import joblib
+    return joblib.load(_data_path(f"{stem}.joblib"))
 
 
-@lru_cache(maxsize=1)
 def get_stage1_model():
-    return joblib.load(_data_path("logreg_minilm_c10.joblib"))
+    return _registry.get("classifier", "stage1", STAGE1_ARTIFACT, lambda: _load_classifier(STAGE1_ARTIFACT))
 
 
-@lru_cache(maxsize=1)
 def get_stage2_model():
-    return joblib.load(_data_path("logreg_direction_pair_c100.joblib"))
\ No newline at end of file
+    return _registry.get("classifier", "stage2", STAGE2_ARTIFACT, lambda: _load_classifier(STAGE2_ARTIFACT))
+
+
+def model_stats() -> list[dict]:
+    return _registry.stats()
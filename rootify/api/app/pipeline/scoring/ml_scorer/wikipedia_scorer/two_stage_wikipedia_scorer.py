@@ -1,7 +1,11 @@
+import os
 import re
 import json
 import numpy as np
-from .registry import get_encoder, get_stage1_meta, get_stage2_meta, get_stage1_model, get_stage2_model
+from app.compute import run_ml
+from .batching import MicroBatcher
+from .embedding_cache import embedding_cache_stats, encode_cached
+from .registry import canonical_encoder_name, encoder_cache_name, get_encoder, get_stage1_meta, get_stage2_meta, get_stage1_model, get_stage2_model, model_stats
 
 # Stage 1 feature arrays + aligned dataframe for bucket info
 X_TEST_PATH = "X_test.npy"
@@ -12,6 +16,10 @@ TEST_DF_PATH = "wikipedia_testing.csv"
 ENCODER_NAME_FALLBACK = "all-MiniLM-L6-v2"
 BATCH_SIZE = 64
 
+# Cross-request batching in front of ml_score_wikipedia
+SCORER_MAX_BATCH_SIZE = int(os.getenv("SCORER_MAX_BATCH_SIZE", str(BATCH_SIZE)))
+SCORER_MAX_WAIT_MS = float(os.getenv("SCORER_MAX_WAIT_MS", "10"))
+
 RX = re.compile(
     r"\[SUBJECT\]\s*(.*?)\s*\[CANDIDATE\]\s*(.*?)\s*\[CONTEXT\]\s*(.*)$",
     re.DOTALL,
@@ -42,21 +50,27 @@ def swap_input_text(s: str):
     subj, cand, ctx = parsed
     return f"[SUBJECT] {cand} [CANDIDATE] {subj} [CONTEXT] {ctx}"
 
-def pair_features(encoder, A_texts, B_texts, batch_size):
-    embA = encoder.encode(A_texts, batch_size=batch_size, show_progress_bar=False)
-    embB = encoder.encode(B_texts, batch_size=batch_size, show_progress_bar=False)
+def pair_features(encoder, A_texts, B_texts, batch_size, embA=None, encoder_name=None):
+    if encoder_name is None:
+        encode = lambda texts: encoder.encode(texts, batch_size=batch_size, show_progress_bar=False)
+    else:
+        encode = lambda texts: encode_cached(encoder, encoder_name, texts, batch_size)
+    if embA is None:
+        embA = encode(A_texts)
+    embB = encode(B_texts)
     return np.concatenate([embA, embB, embA - embB, embA * embB], axis=1)
 
 def ml_score_wikipedia(input_texts):
-    encoder1 = get_encoder()
-    embeddings = encoder1.encode(input_texts, batch_size=BATCH_SIZE, show_progress_bar=False)
-
     stage1_meta = get_stage1_meta()
     stage2_meta = get_stage2_meta()
 
+    encoder1_name = canonical_encoder_name(stage1_meta.get("encoder", ENCODER_NAME_FALLBACK))
+    encoder1 = get_encoder(encoder1_name)
+    embeddings = encode_cached(encoder1, encoder_cache_name(encoder1_name), input_texts, BATCH_SIZE)
+
     T_KEEP = float(stage1_meta.get("T_junk", stage1_meta.get("T", 0.6)))
     FLIP_T = 0.1
-    encoder_name = stage2_meta.get("encoder", ENCODER_NAME_FALLBACK)
+    encoder_name = canonical_encoder_name(stage2_meta.get("encoder", ENCODER_NAME_FALLBACK))
 
     stage1 = get_stage1_model()
     p = stage1.predict_proba(embeddings)[:, 1]
@@ -82,7 +96,11 @@ def ml_score_wikipedia(input_texts):
     if kept_idx:
         stage2 = get_stage2_model()
         encoder2 = get_encoder(encoder_name)
-        X_dir = pair_features(encoder2, A_texts, B_texts, BATCH_SIZE)
+        embA = None
+        if encoder_name == encoder1_name:
+            # A texts are the original inputs, already encoded for stage 1
+            embA = embeddings[kept_idx]
+        X_dir = pair_features(encoder2, A_texts, B_texts, BATCH_SIZE, embA=embA, encoder_name=encoder_cache_name(encoder_name))
         pA = stage2.predict_proba(X_dir)[:, 1]
         for j, i in enumerate(kept_idx):
             pA_by_i[i] = float(pA[j])
@@ -106,3 +124,19 @@ def ml_score_wikipedia(input_texts):
             out.append({"input_text": input_text, "p_valid": p_valid, "is_junk": False})
 
     return out
+
+_scoring_batcher: MicroBatcher | None = None
+
+def get_scoring_batcher() -> MicroBatcher:
+    global _scoring_batcher
+    if _scoring_batcher is None:
+        _scoring_batcher = MicroBatcher(ml_score_wikipedia, SCORER_MAX_BATCH_SIZE, SCORER_MAX_WAIT_MS, run=run_ml)
+    return _scoring_batcher
+
+async def ml_score_wikipedia_batched(input_texts):
+    # Each text is scored independently, so concurrent callers can share encoder and classifier batches.
+    return await get_scoring_batcher().submit_many(list(input_texts))
+
+def scorer_stats() -> dict:
+    # runs wherever the models live, i.e. inside the ml compute worker
+    return {"models": model_stats(), "embedding_cache": embedding_cache_stats()}
@@ -0,0 +1,318 @@
+import bz2
+import os
+import re
+import time
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass
+from html import unescape
+from typing import Iterable, Iterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Artist
+from app.pipeline.wiki_fetch import WikiPage, parse_extract
+from app.pipeline.wiki_sections import select_relevant_sections
+from app.pipeline.wiki_store import write_wikipedia_sections
+
+WIKI_DUMP_SAMPLE = os.path.join(os.path.dirname(__file__), "wiki_dump_sample.xml.bz2")
+WIKI_DUMP_COMMIT_EVERY = int(os.getenv("WIKI_DUMP_COMMIT_EVERY", "200"))
+
+
+@dataclass
+class DumpPage:
+    title: str
+    ns: int
+    redirect: str | None
+    revid: int | None
+    timestamp: str | None
+    text: str
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def iter_dump_pages(path: str, namespaces: tuple[int, ...] = (0,)) -> Iterator[DumpPage]:
+    """Stream <page> elements from a pages-articles dump (.xml or .xml.bz2) in constant memory."""
+    opener = bz2.open if path.endswith(".bz2") else open
+    with opener(path, "rb") as f:
+        context = ET.iterparse(f, events=("start", "end"))
+        _, root = next(context)
+        for event, elem in context:
+            if event != "end" or _local(elem.tag) != "page":
+                continue
+            fields = {}
+            redirect = None
+            for child in elem.iter():
+                name = _local(child.tag)
+                if name == "redirect":
+                    redirect = child.get("title")
+                elif name == "revision":
+                    rev_id = next((c.text for c in child if _local(c.tag) == "id"), None)
+                    fields["revid"] = int(rev_id) if rev_id else None
+                elif name in ("title", "ns", "timestamp", "text") and name not in fields:
+                    fields[name] = child.text or ""
+            # drop the parsed subtree; the root would otherwise keep every page alive
+            root.clear()
+
+            ns = int(fields.get("ns") or 0)
+            if ns not in namespaces:
+                continue
+            yield DumpPage(
+                title=fields.get("title", ""),
+                ns=ns,
+                redirect=redirect,
+                revid=fields.get("revid"),
+                timestamp=fields.get("timestamp") or None,
+                text=fields.get("text", ""),
+            )
+
+
+_RE_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+_RE_REF = re.compile(r"<ref\b[^>/]*/>|<ref\b[^>]*>.*?</ref\s*>", re.DOTALL | re.IGNORECASE)
+_RE_BLOCK_TAGS = re.compile(
+    r"<(gallery|math|score|timeline|syntaxhighlight|graph|mapframe|imagemap)\b[^>]*>.*?</\1\s*>",
+    re.DOTALL | re.IGNORECASE,
+)
+_RE_TEMPLATE = re.compile(r"\{\{([^{}]*)\}\}")
+_RE_TABLE = re.compile(r"\{\|(?:(?!\{\|).)*?\|\}", re.DOTALL)
+_RE_LINK = re.compile(r"\[\[([^\[\]]*)\]\]")
+_RE_EXT_LINK = re.compile(r"\[(?:https?:)?//[^\s\]]+\s*([^\]]*)\]")
+_RE_QUOTES = re.compile(r"'{2,}")
+_RE_TAG = re.compile(r"<[^>]+>")
+_RE_BR = re.compile(r"<br\s*/?>", re.IGNORECASE)
+_RE_MAGIC = re.compile(r"__[A-Z]+__")
+_RE_HEADING = re.compile(r"^(={2,6})\s*(.*?)\s*\1\s*$")
+_RE_DISAMBIGUATION = re.compile(r"\{\{\s*(disambiguation|disambig|dab|hndis|set index)\b", re.IGNORECASE)
+# inline templates whose argument is visible text: name -> 1-based positional arg shown
+_INLINE_TEMPLATES = {"nowrap": 1, "nobr": 1, "lang": 2, "ill": 1, "not a typo": 1, "small": 1, "sic": 1, "nihongo": 1}
+_DROP_LINK_PREFIXES = ("file", "image", "media", "category")
+
+
+def _template(match: re.Match) -> str:
+    parts = match.group(1).split("|")
+    name = parts[0].strip().lower()
+    pos = _INLINE_TEMPLATES.get(name)
+    if pos is None:
+        return ""
+    args = [p for p in parts[1:] if "=" not in p]
+    return args[pos - 1].strip() if len(args) >= pos else ""
+
+
+def _link(match: re.Match) -> str:
+    inner = match.group(1)
+    target, _, label = inner.partition("|")
+    prefix, colon, _ = target.partition(":")
+    if colon and not target.startswith(":"):
+        # files, categories and interlanguage links ("fr:...") render no inline text
+        if prefix.strip().lower() in _DROP_LINK_PREFIXES or re.fullmatch(r"[a-z]{2,3}(-[a-z]+)?", prefix.strip()):
+            return ""
+    return (label or target.lstrip(":")).strip()
+
+
+def _sub_until_stable(pattern: re.Pattern, repl, text: str) -> str:
+    while True:
+        new = pattern.sub(repl, text)
+        if new == text:
+            return text
+        text = new
+
+
+def wikitext_to_extract(wikitext: str) -> str:
+    """Approximate the plain-text (exsectionformat=wiki) extract of a page from its wikitext."""
+    text = _RE_COMMENT.sub("", wikitext)
+    text = _RE_REF.sub("", text)
+    text = _RE_BLOCK_TAGS.sub("", text)
+    text = _sub_until_stable(_RE_TEMPLATE, _template, text)
+    text = _sub_until_stable(_RE_TABLE, "", text)
+    # innermost first, so links inside file captions resolve before the file link is dropped
+    text = _sub_until_stable(_RE_LINK, _link, text)
+    text = _RE_EXT_LINK.sub(lambda m: m.group(1), text)
+    text = _RE_QUOTES.sub("", text)
+    text = _RE_BR.sub("\n", text)
+    text = _RE_TAG.sub("", text)
+    text = _RE_MAGIC.sub("", text)
+    # "({{IPA|...}}; born 1965)" leaves "(; born 1965)" once the template is gone
+    text = re.sub(r"\(\s*[;,]\s*", "(", text)
+    text = re.sub(r"\s*\(\s*\)", "", text)
+    text = unescape(text)
+
+    out = []
+    for line in text.split("\n"):
+        heading = _RE_HEADING.match(line.strip())
+        if heading:
+            marks = heading.group(1)
+            out.append(f"\n\n{marks} {heading.group(2)} {marks}\n")
+            continue
+        line = re.sub(r"^[*#:;]+\s*", "", line.strip())
+        if not line or line[0] in "|!" or line.startswith(("{|", "|}")):
+            continue
+        if out and not out[-1].endswith("\n"):
+            out.append("\n")
+        out.append(line)
+    # headings keep their "\n\n" / "\n" framing, which parse_extract keys on
+    return "".join(out)
+
+
+def dump_page_to_wiki_page(page: DumpPage) -> WikiPage:
+    summary, sections = parse_extract(wikitext_to_extract(page.text))
+    return WikiPage(title=page.title, summary=summary, sections=sections, revid=page.revid, touched=page.timestamp)
+
+
+def _title_key(title: str) -> str:
+    return re.sub(r"\s+", " ", title.replace("_", " ")).strip().casefold()
+
+
+_RE_QUALIFIED = re.compile(r"^(.*\S)\s+\(([^()]*)\)$")
+_MUSIC_QUALIFIERS = (
+    "band", "musician", "singer", "rapper", "group", "duo", "composer", "dj",
+    "producer", "songwriter", "guitarist", "drummer", "pianist", "artist", "entertainer",
+)
+
+
+class ArtistTitleIndex:
+    """Map dump page titles to Artist rows the way a live lookup by name would resolve them.
+
+    Priority 0 is the page titled after the artist (or the target of a redirect with
+    that title), 1 a music-disambiguated title like "Nirvana (band)", 2 a
+    disambiguation page titled after the artist.
+    """
+
+    def __init__(self, artists: Iterable[tuple[int, str]]) -> None:
+        self._by_key: dict[str, list[int]] = {}
+        for artist_id, name in artists:
+            self._by_key.setdefault(_title_key(name), []).append(artist_id)
+        self._redirect_targets: dict[str, list[int]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._by_key.values())
+
+    def note_redirect(self, title: str, target: str) -> bool:
+        """Map artists named ``title`` to the page ``target``; True if any artist has that name."""
+        ids = self._by_key.get(_title_key(title))
+        if not ids:
+            return False
+        targets = self._redirect_targets.setdefault(_title_key(target), [])
+        targets.extend(artist_id for artist_id in ids if artist_id not in targets)
+        return True
+
+    def match(self, title: str, disambiguation: bool = False) -> list[tuple[int, int]]:
+        key = _title_key(title)
+        out = [(artist_id, 2 if disambiguation else 0) for artist_id in self._by_key.get(key, [])]
+        out += [(artist_id, 0) for artist_id in self._redirect_targets.get(key, [])]
+        qualified = _RE_QUALIFIED.match(key)
+        if qualified and any(q in qualified.group(2).split() for q in _MUSIC_QUALIFIERS):
+            out += [(artist_id, 1) for artist_id in self._by_key.get(qualified.group(1), [])]
+        return out
+
+
+# <title>, <ns>, <id> and an optional <redirect/> open every <page> in this order
+_RE_DUMP_PAGE_HEAD = re.compile(
+    rb"<title>([^<]*)</title>\s*<ns>(-?\d+)</ns>\s*<id>\d+</id>\s*(?:<redirect title=\"([^\"]*)\")?"
+)
+_DUMP_SCAN_CHUNK = 8 * 1024 * 1024
+
+
+def iter_dump_redirects(path: str, limit: int | None = None) -> Iterator[tuple[str, str]]:
+    """(title, target) of every main-namespace redirect, from a regex scan that never parses page text.
+
+    Markup inside <text> is escaped, so only a page's own header can match.
+    """
+    opener = bz2.open if path.endswith(".bz2") else open
+    pages = 0
+    buf = b""
+    with opener(path, "rb") as f:
+        while True:
+            chunk = f.read(_DUMP_SCAN_CHUNK)
+            buf += chunk
+            # scan up to the last complete page; the rest waits for the next chunk
+            cut = len(buf) if not chunk else buf.rfind(b"</page>") + len(b"</page>")
+            for m in _RE_DUMP_PAGE_HEAD.finditer(buf, 0, cut):
+                if m.group(2) != b"0":
+                    continue
+                pages += 1
+                if limit is not None and pages > limit:
+                    return
+                if m.group(3) is not None:
+                    yield unescape(m.group(1).decode("utf-8")), unescape(m.group(3).decode("utf-8"))
+            if not chunk:
+                return
+            if cut >= len(b"</page>"):
+                buf = buf[cut:]
+
+
+def load_redirects(path: str, index: ArtistTitleIndex, limit: int | None = None) -> int:
+    """Register every redirect titled after an artist; returns how many matched."""
+    return sum(index.note_redirect(title, target) for title, target in iter_dump_redirects(path, limit))
+
+
+def iter_matched_sections(
+    path: str,
+    index: ArtistTitleIndex,
+    stats: dict | None = None,
+    limit: int | None = None,
+) -> Iterator[tuple[int, list[dict], dict]]:
+    """(artist_id, sections, revision) for every dump page that is the best match so far for an artist.
+
+    Redirects are collected in a first, text-skipping pass over the dump, since a
+    redirect usually has a higher page id than the article it points to. An
+    artist can be yielded again when a better-ranked page turns up later in the
+    dump; writing each result in order leaves the best page stored.
+    """
+    stats = stats if stats is not None else {}
+    stats.setdefault("pages_scanned", 0)
+    stats.setdefault("pages_matched", 0)
+    t0 = time.perf_counter()
+    stats["redirects_matched"] = load_redirects(path, index, limit)
+    stats["redirect_scan_s"] = round(time.perf_counter() - t0, 3)
+    best: dict[int, int] = {}
+    for page in iter_dump_pages(path):
+        if limit is not None and stats["pages_scanned"] >= limit:
+            break
+        stats["pages_scanned"] += 1
+        if page.redirect:
+            continue
+
+        matches = index.match(page.title, disambiguation=bool(_RE_DISAMBIGUATION.search(page.text)))
+        matches = [(artist_id, prio) for artist_id, prio in matches if best.get(artist_id, 99) > prio]
+        if not matches:
+            continue
+        stats["pages_matched"] += 1
+        sections = select_relevant_sections(dump_page_to_wiki_page(page))
+        revision = {"title": page.title, "revid": page.revid, "touched": page.timestamp}
+        for artist_id, prio in matches:
+            best[artist_id] = prio
+            yield artist_id, sections, revision
+
+
+async def ingest_wiki_dump(
+    session: AsyncSession,
+    path: str,
+    commit_every: int = WIKI_DUMP_COMMIT_EVERY,
+    limit: int | None = None,
+) -> dict:
+    """Write EvidenceSection rows for every Artist found in a local dump; never calls the live API."""
+    artists = (await session.execute(select(Artist.id, Artist.name))).all()
+    index = ArtistTitleIndex((a.id, a.name) for a in artists)
+
+    stats = {"artists": len(index), "artists_written": 0, "sections_written": 0}
+    written = set()
+    pending = 0
+    t0 = time.perf_counter()
+    for artist_id, sections, revision in iter_matched_sections(path, index, stats, limit=limit):
+        stats["sections_written"] += await write_wikipedia_sections(session, artist_id, sections, revision)
+        written.add(artist_id)
+        pending += 1
+        if pending >= commit_every:
+            await session.commit()
+            # keep the identity map from growing with the dump
+            session.expunge_all()
+            pending = 0
+    await session.commit()
+
+    elapsed = time.perf_counter() - t0
+    stats["artists_written"] = len(written)
+    stats["elapsed_s"] = round(elapsed, 3)
+    stats["pages_per_s"] = round(stats["pages_scanned"] / elapsed, 1) if elapsed else 0.0
+    return stats
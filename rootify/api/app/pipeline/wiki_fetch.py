@@ -1,20 +1,379 @@
-import wikipediaapi
+import asyncio
+import hashlib
+import importlib.util
+import json
+import os
+import re
+from dataclasses import dataclass, field
+from html import unescape
+from html.parser import HTMLParser
 
-def _wiki_client() -> wikipediaapi.Wikipedia:
-    return wikipediaapi.Wikipedia(
-        user_agent="Rootify/0.1 (contact: dev@rootify.local)",
-        language="en",
-        extract_format = wikipediaapi.ExtractFormat.WIKI
-    )
+import httpx
 
-def fetch_wikipedia_page_obj(artist_name: str) -> wikipediaapi.WikipediaPage:
-    wiki = _wiki_client()
+WIKI_API_URL = os.getenv("MEDIAWIKI_API_URL", "https://en.wikipedia.org/w/api.php")
+WIKI_USER_AGENT = "Rootify/0.1 (contact: dev@rootify.local)"
+MEDIAWIKI_MAX_CONCURRENCY = int(os.getenv("MEDIAWIKI_MAX_CONCURRENCY", "8"))
+MEDIAWIKI_HTTP2 = os.getenv("MEDIAWIKI_HTTP2", "1") == "1"
+# replay recorded API responses from this directory instead of calling Wikipedia
+MEDIAWIKI_FIXTURE_DIR = os.getenv("MEDIAWIKI_FIXTURE_DIR")
+# with a fixture dir: fetch misses from the live API and save them
+MEDIAWIKI_RECORD = os.getenv("MEDIAWIKI_RECORD") == "1"
 
-    page = wiki.page(artist_name)
+# same heading pattern wikipediaapi uses for ExtractFormat.WIKI, so section text (and its hash) is unchanged
+_RE_SECTION = re.compile(r"\n\n *(==+) (.*?) (==+) *\n")
 
-    if not page.exists():
+
+@dataclass
+class WikiSection:
+    title: str
+    level: int
+    text: str = ""
+    sections: list["WikiSection"] = field(default_factory=list)
+
+    def full_text(self) -> str:
+        res = self.title + "\n" + self.text
+        if self.text:
+            res += "\n\n"
+        for sec in self.sections:
+            res += sec.full_text()
+        return res
+
+
+@dataclass
+class WikiPage:
+    title: str
+    summary: str
+    sections: list[WikiSection]
+    pageid: int | None = None
+    revid: int | None = None
+    touched: str | None = None
+
+    @property
+    def text(self) -> str:
+        txt = self.summary
+        if txt:
+            txt += "\n\n"
+        for sec in self.sections:
+            txt += sec.full_text()
+        return txt.strip()
+
+
+def parse_extract(extract: str) -> tuple[str, list[WikiSection]]:
+    """Split a plain-text (exsectionformat=wiki) extract into summary and a nested section tree."""
+    summary = ""
+    top: list[WikiSection] = []
+    stack: list[WikiSection] = []
+    section = None
+    prev_pos = 0
+    for match in _RE_SECTION.finditer(extract):
+        if section is None:
+            summary = extract[: match.start()].strip()
+        else:
+            section.text = extract[prev_pos : match.start()].strip()
+
+        section = WikiSection(title=match.group(2).strip(), level=len(match.group(1)) - 1)
+        while stack and stack[-1].level >= section.level:
+            stack.pop()
+        (stack[-1].sections if stack else top).append(section)
+        stack.append(section)
+        prev_pos = match.end()
+
+    if not summary:
+        summary = extract.strip()
+    if section is not None:
+        section.text = extract[prev_pos:]
+    return summary, top
+
+
+# parse HTML that TextExtracts also leaves out of plain-text extracts
+_DROP_TAGS = {"table", "figure", "script", "style", "math", "audio", "video"}
+_DROP_CLASSES = {
+    "mw-editsection", "reference", "references", "noprint", "error", "nomobile",
+    "noexcerpt", "sortkey", "navbox", "gallery", "mw-empty-elt", "mwe-math-element",
+}
+_KEEP_DIV_CLASSES = {"mw-parser-output", "mw-heading"}
+_BLOCK_TAGS = {"p", "li", "dd", "dt", "blockquote", "pre", "ul", "ol", "dl"}
+_VOID_TAGS = {"br", "img", "input", "meta", "link", "wbr", "hr", "source", "track", "area", "col"}
+
+
+class _SectionTextParser(HTMLParser):
+    """Plain text of one section's own body from action=parse HTML (subsections excluded)."""
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self.headings = 0
+        self.done = False
+        self._depth = 0
+        self._skip_at: int | None = None
+
+    def _dropped(self, tag: str, attrs) -> bool:
+        classes = set((dict(attrs).get("class") or "").split())
+        if tag == "div":
+            return not classes & _KEEP_DIV_CLASSES
+        return tag in _DROP_TAGS or bool(classes & _DROP_CLASSES)
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag in ("h2", "h3", "h4", "h5", "h6"):
+            self.headings += 1
+            if self.headings > 1:
+                # first subsection: wikipediaapi keeps that text on the child section
+                self.done = True
+                return
+        if tag in _VOID_TAGS:
+            if tag == "br" and self._skip_at is None:
+                self.parts.append("\n")
+            return
+        self._depth += 1
+        if self._skip_at is None and (tag.startswith("h") and tag[1:].isdigit() or self._dropped(tag, attrs)):
+            self._skip_at = self._depth
+
+    def handle_endtag(self, tag):
+        if self.done or tag in _VOID_TAGS:
+            return
+        if self._skip_at is None and tag in _BLOCK_TAGS:
+            self.parts.append("\n")
+        if self._skip_at == self._depth:
+            self._skip_at = None
+        self._depth = max(0, self._depth - 1)
+
+    def handle_data(self, data):
+        if not self.done and self._skip_at is None:
+            self.parts.append(data)
+
+
+def section_html_to_text(html: str) -> str:
+    parser = _SectionTextParser()
+    parser.feed(html)
+    parser.close()
+    lines = (line.strip() for line in "".join(parser.parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+
+def _plain_heading(line: str) -> str:
+    return unescape(re.sub(r"<[^>]+>", "", line)).strip()
+
+
+class FixtureTransport(httpx.AsyncBaseTransport):
+    """Serve API responses from JSON files keyed by the request's query parameters.
+
+    With ``record=True`` misses are fetched through ``upstream`` and written
+    out, so a live run can seed fixtures for later offline runs.
+    """
+
+    def __init__(self, fixture_dir: str, record: bool = False, upstream: httpx.AsyncBaseTransport | None = None) -> None:
+        self.fixture_dir = fixture_dir
+        self.record = record
+        self._upstream = upstream
+        os.makedirs(fixture_dir, exist_ok=True)
+
+    @staticmethod
+    def fixture_key(params) -> str:
+        items = sorted((k, v) for k, v in params.multi_items())
+        return hashlib.sha1(json.dumps(items).encode("utf-8")).hexdigest()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        path = os.path.join(self.fixture_dir, self.fixture_key(request.url.params) + ".json")
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                return httpx.Response(200, json=json.load(f)["body"], request=request)
+        if not self.record:
+            raise FileNotFoundError(f"No MediaWiki fixture for {request.url} ({path})")
+
+        if self._upstream is None:
+            self._upstream = httpx.AsyncHTTPTransport(http2=_http2_available())
+        response = await self._upstream.handle_async_request(request)
+        await response.aread()
+        if response.status_code == 200:
+            with open(path, "w") as f:
+                json.dump({"params": dict(request.url.params.multi_items()), "body": response.json()}, f, indent=1)
+        return httpx.Response(response.status_code, content=response.content, headers=response.headers, request=request)
+
+    async def aclose(self) -> None:
+        if self._upstream is not None:
+            await self._upstream.aclose()
+
+
+def _http2_available() -> bool:
+    return MEDIAWIKI_HTTP2 and importlib.util.find_spec("h2") is not None
+
+
+class MediaWikiClient:
+    """One pooled httpx client for the MediaWiki action API, with at most ``max_concurrency`` requests in flight."""
+
+    def __init__(
+        self,
+        api_url: str = WIKI_API_URL,
+        max_concurrency: int = MEDIAWIKI_MAX_CONCURRENCY,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ) -> None:
+        self.api_url = api_url
+        self.max_concurrency = max(1, max_concurrency)
+        self._transport = transport
+        self._client: httpx.AsyncClient | None = None
+        self._sem: asyncio.Semaphore | None = None
+
+        self.requests = 0
+        self.bytes_received = 0
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None:
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+            kwargs = {"transport": self._transport} if self._transport is not None else {"http2": _http2_available()}
+            self._client = httpx.AsyncClient(
+                headers={"User-Agent": WIKI_USER_AGENT, "Accept-Encoding": "gzip"},
+                timeout=10.0,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+                **kwargs,
+            )
+        return self._client
+
+    async def query(self, params: dict) -> dict:
+        client = self._get_client()
+        params = {"format": "json", "formatversion": 2, "redirects": 1, **params}
+        params = {k: v for k, v in params.items() if v is not None}
+        async with self._sem:
+            r = await client.get(self.api_url, params=params)
+        r.raise_for_status()
+        self.requests += 1
+        self.bytes_received += int(r.headers.get("content-length") or len(r.content))
+        data = r.json()
+        if "error" in data:
+            raise RuntimeError(f"MediaWiki API error: {data['error'].get('code')}: {data['error'].get('info')}")
+        return data
+
+    @staticmethod
+    def _first_page(data: dict) -> dict | None:
+        pages = data.get("query", {}).get("pages", [])
+        if not pages or pages[0].get("missing") or pages[0].get("invalid"):
+            return None
+        return pages[0]
+
+    async def fetch_page(self, title: str) -> WikiPage | None:
+        """Plain-text extract plus revision info for ``title`` in one request; None if there is no such page."""
+        page = self._first_page(
+            await self.query(
+                {
+                    "action": "query",
+                    "prop": "extracts|info",
+                    "titles": title,
+                    "explaintext": 1,
+                    "exsectionformat": "wiki",
+                }
+            )
+        )
+        if page is None:
+            return None
+        summary, sections = parse_extract(page.get("extract") or "")
+        return WikiPage(
+            title=page.get("title", title),
+            summary=summary,
+            sections=sections,
+            pageid=page.get("pageid"),
+            revid=page.get("lastrevid"),
+            touched=page.get("touched"),
+        )
+
+    async def fetch_toc(self, title: str) -> dict | None:
+        """Revision info plus the section list of ``title``, pinned to that revision; no section text."""
+        revision = await self.fetch_revision(title)
+        if revision is None or revision["revid"] is None:
+            return None
+        data = await self.query(
+            {"action": "parse", "oldid": revision["revid"], "prop": "sections", "redirects": None}
+        )
+        sections = []
+        for sec in data.get("parse", {}).get("sections", []):
+            # "T-1" style indices belong to transcluded templates and can't be fetched by number
+            if not str(sec.get("index", "")).isdigit():
+                continue
+            sections.append(
+                {
+                    "index": int(sec["index"]),
+                    "level": int(sec.get("level") or 2) - 1,
+                    "title": _plain_heading(sec.get("line", "")),
+                    "byteoffset": sec.get("byteoffset"),
+                }
+            )
+        return {**revision, "sections": sections}
+
+    async def fetch_section_text(self, revid: int, index: int) -> str:
+        """Plain text of section ``index`` at ``revid``, without its subsections."""
+        data = await self.query(
+            {
+                "action": "parse",
+                "oldid": revid,
+                "section": index,
+                "prop": "text",
+                "disablelimitreport": 1,
+                "disableeditsection": 1,
+                "redirects": None,
+            }
+        )
+        return section_html_to_text(data.get("parse", {}).get("text", ""))
+
+    async def fetch_revision(self, title: str) -> dict | None:
+        page = self._first_page(await self.query({"action": "query", "prop": "info", "titles": title}))
+        if page is None:
+            return None
+        return {"title": page.get("title", title), "revid": page.get("lastrevid"), "touched": page.get("touched")}
+
+    def stats(self) -> dict:
+        return {
+            "requests": self.requests,
+            "bytes_received": self.bytes_received,
+            "max_concurrency": self.max_concurrency,
+            "http2": self._transport is None and _http2_available(),
+            "fixtures": isinstance(self._transport, FixtureTransport),
+        }
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_client: MediaWikiClient | None = None
+
+
+def get_mediawiki_client() -> MediaWikiClient:
+    global _client
+    if _client is None:
+        transport = None
+        if MEDIAWIKI_FIXTURE_DIR:
+            transport = FixtureTransport(MEDIAWIKI_FIXTURE_DIR, record=MEDIAWIKI_RECORD)
+        _client = MediaWikiClient(transport=transport)
+    return _client
+
+
+async def fetch_wikipedia_page_obj(artist_name: str) -> WikiPage:
+    page = await get_mediawiki_client().fetch_page(artist_name)
+    if page is None:
         raise ValueError(f"Wikipedia page not found for: {artist_name}")
     return page
 
-def fetch_wikipedia_page(artist_name: str) -> str:
-    return fetch_wikipedia_page_obj(artist_name).text
\ No newline at end of file
+
+async def fetch_wikipedia_page(artist_name: str) -> str:
+    return (await fetch_wikipedia_page_obj(artist_name)).text
+
+
+def page_revision(page: WikiPage) -> dict:
+    return {"title": page.title, "revid": page.revid, "touched": page.touched}
+
+
+async def fetch_wikipedia_toc(title: str) -> dict | None:
+    return await get_mediawiki_client().fetch_toc(title)
+
+
+async def fetch_wikipedia_section_text(revid: int, index: int) -> str:
+    return await get_mediawiki_client().fetch_section_text(revid, index)
+
+
+async def fetch_wikipedia_revision(title: str) -> dict | None:
+    """Current revid/touched of ``title`` via a single prop=info query; None if the page is gone."""
+    return await get_mediawiki_client().fetch_revision(title)
@@ -1,6 +1,16 @@
 from typing import List, Dict, Tuple
+import asyncio
+import os
 import re
-from app.pipeline.wiki_fetch import fetch_wikipedia_page_obj
+from app.pipeline.wiki_fetch import (
+    fetch_wikipedia_page_obj,
+    fetch_wikipedia_section_text,
+    fetch_wikipedia_toc,
+    page_revision,
+)
+
+# "sections": table of contents first, then only the matching sections; "full": whole extract
+WIKI_FETCH_MODE = os.getenv("WIKI_FETCH_MODE", "sections")
 
 DEFAULT_SECTION_KEYWORDS = [
     "Influences",
@@ -86,13 +96,30 @@ def _iter_sections_with_paths(page) -> List[Tuple[str, str]]:
 def _norm(s: str) -> str:
     return re.sub(r"\s+", " ", s.strip().lower())
 
-def extract_relevant_sections(
-    artist_name: str,
-    keywords: List[str] = DEFAULT_SECTION_KEYWORDS,
-) -> List[Dict[str, str]]:
-    page = fetch_wikipedia_page_obj(artist_name)
-    sections = _iter_sections_with_paths(page)
+def _toc_paths(toc_sections: List[Dict]) -> List[Tuple[str, Dict]]:
+    out = []
+    stack: List[Tuple[int, str]] = []
+    for sec in toc_sections:
+        while stack and stack[-1][0] >= sec["level"]:
+            stack.pop()
+        path = f"{stack[-1][1]} > {sec['title']}" if stack else sec["title"]
+        out.append((path, sec))
+        stack.append((sec["level"], path))
+    return out
 
+def _heading_only(entries: List[Tuple[str, Dict]], i: int) -> bool:
+    # a parent whose first child starts right after its own heading has no text of its own;
+    # fetching it would download the whole subtree just to throw it away
+    sec = entries[i][1]
+    if i + 1 >= len(entries):
+        return False
+    nxt = entries[i + 1][1]
+    if nxt["level"] <= sec["level"] or sec["byteoffset"] is None or nxt["byteoffset"] is None:
+        return False
+    heading_bytes = len(sec["title"].encode("utf-8")) + 2 * (sec["level"] + 1) + 3
+    return nxt["byteoffset"] - sec["byteoffset"] <= heading_bytes + 16
+
+def _select_paths(paths: List[str], keywords: List[str]) -> List[Tuple[str, str]]:
     found = []
     used_paths = set()
 
@@ -101,7 +128,7 @@ def extract_relevant_sections(
         alias_norms = [_norm(a) for a in aliases]
 
         best = []
-        for path, text in sections:
+        for path in paths:
             if path in used_paths:
                 continue
             title = path.split(" > ")[-1]
@@ -120,15 +147,68 @@ def extract_relevant_sections(
             if score is None:
                 continue
 
-            best.append((score, path, text))
+            best.append((score, path))
 
         best.sort(key=lambda x: (-x[0], len(x[1])))
-        for _, path, text in best:
+        for _, path in best:
             if path in used_paths:
                 continue
-            found.append({"keyword": kw, "section_path": path, "text": text})
+            found.append((kw, path))
             used_paths.add(path)
+    return found
+
+async def extract_relevant_sections(
+    artist_name: str,
+    keywords: List[str] = DEFAULT_SECTION_KEYWORDS,
+) -> List[Dict[str, str]]:
+    return (await fetch_relevant_sections(artist_name, keywords))[0]
+
+async def fetch_relevant_sections(
+    artist_name: str,
+    keywords: List[str] = DEFAULT_SECTION_KEYWORDS,
+) -> Tuple[List[Dict[str, str]], Dict]:
+    """Relevant sections of the artist's page plus the revision they were read from.
+
+    Titles are scored from the table of contents, so only matching sections are
+    downloaded; the whole extract is fetched only for the full-page fallback.
+    """
+    if WIKI_FETCH_MODE == "full":
+        page = await fetch_wikipedia_page_obj(artist_name)
+        return select_relevant_sections(page, keywords), page_revision(page)
+
+    toc = await fetch_wikipedia_toc(artist_name)
+    if toc is None:
+        raise ValueError(f"Wikipedia page not found for: {artist_name}")
+    revision = {"title": toc["title"], "revid": toc["revid"], "touched": toc["touched"]}
+
+    entries = _toc_paths(toc["sections"])
+    selected = _select_paths([path for path, _ in entries], keywords)
+    if not selected:
+        page = await fetch_wikipedia_page_obj(artist_name)
+        return select_relevant_sections(page, keywords), page_revision(page)
+
+    first = {}
+    for i, (path, _) in enumerate(entries):
+        first.setdefault(path, i)
+    wanted = [path for path in dict.fromkeys(path for _, path in selected) if not _heading_only(entries, first[path])]
+    texts = await asyncio.gather(
+        *(fetch_wikipedia_section_text(toc["revid"], entries[first[path]][1]["index"]) for path in wanted)
+    )
+    by_path = dict(zip(wanted, texts))
+    return [{"keyword": kw, "section_path": path, "text": by_path.get(path, "")} for kw, path in selected], revision
+
+def select_relevant_sections(
+    page,
+    keywords: List[str] = DEFAULT_SECTION_KEYWORDS,
+) -> List[Dict[str, str]]:
+    texts = {}
+    for path, text in _iter_sections_with_paths(page):
+        texts.setdefault(path, text)
 
+    found = [
+        {"keyword": kw, "section_path": path, "text": texts[path]}
+        for kw, path in _select_paths(list(texts), keywords)
+    ]
     if not found:
         return [{"keyword": "FALLBACK_FULL_PAGE", "section_path": page.title, "text": page.text}]
     return found
@@ -1,33 +1,142 @@
-from sqlalchemy import delete
+from datetime import datetime, timezone
+
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models import EvidenceSection
-from app.pipeline.wiki_sections import extract_relevant_sections
+from app.models import EvidencePage, EvidenceSection
+from app.pipeline.nlp_annotations import text_hash
+from app.pipeline.wiki_fetch import fetch_wikipedia_revision
+from app.pipeline.wiki_sections import fetch_relevant_sections
+
+async def _get_page(session: AsyncSession, artist_id: int) -> EvidencePage | None:
+    return (
+        await session.execute(
+            select(EvidencePage)
+            .where(EvidencePage.artist_id == artist_id)
+            .where(EvidencePage.source == "wikipedia")
+        )
+    ).scalar_one_or_none()
 
 async def store_wikipedia_sections(
         session: AsyncSession,
         artist_id: int,
         artist_name: str,
 ) -> int:
-    sections = extract_relevant_sections(artist_name)
+    sections, revision = await fetch_relevant_sections(artist_name)
+    await write_wikipedia_sections(session, artist_id, sections, revision)
+    await session.commit()
+    return len(sections)
 
-    await session.execute(
-        delete(EvidenceSection).where((EvidenceSection.artist_id == artist_id) & (EvidenceSection.source == "wikipedia"))
-    )
+async def write_wikipedia_sections(
+        session: AsyncSession,
+        artist_id: int,
+        sections: list[dict],
+        revision: dict,
+) -> int:
+    """Diff ``sections`` against the stored ones by section_path and record ``revision``; does not commit.
+
+    Returns the number of non-empty sections kept.
+    """
+    existing = {
+        sec.section_path: sec
+        for sec in (
+            await session.execute(
+                select(EvidenceSection)
+                .where(EvidenceSection.artist_id == artist_id)
+                .where(EvidenceSection.source == "wikipedia")
+            )
+        ).scalars()
+    }
 
+    now = datetime.now(timezone.utc)
     rows = []
+    unchanged_ids = []
+    seen_paths = set()
     for section in sections:
-        if not section["text"].strip():
+        if not section["text"].strip() or section["section_path"] in seen_paths:
+            continue
+        seen_paths.add(section["section_path"])
+        h = text_hash(section["text"])
+        is_fallback = "FALLBACK_FULL_PAGE" == section['keyword']
+
+        current = existing.get(section["section_path"])
+        if current is not None and current.text_hash == h:
+            unchanged_ids.append(current.id)
+            current.keyword = section['keyword']
+            current.is_fallback = is_fallback
+            continue
+        if current is not None:
+            # changed upstream: new text, and its claims have to be re-extracted
+            current.keyword = section['keyword']
+            current.text = section['text']
+            current.text_hash = h
+            current.is_fallback = is_fallback
+            current.extraction_version = None
+            current.created_at = now
             continue
-        evidence_section = EvidenceSection(
-            artist_id=artist_id,
-            source="wikipedia",
-            keyword=section['keyword'],
-            section_path=section['section_path'],
-            text=section['text'],
-            is_fallback=("FALLBACK_FULL_PAGE" == section['keyword']),
+        rows.append(
+            EvidenceSection(
+                artist_id=artist_id,
+                source="wikipedia",
+                keyword=section['keyword'],
+                section_path=section['section_path'],
+                text=section['text'],
+                text_hash=h,
+                is_fallback=is_fallback,
+            )
+        )
+
+    removed_ids = [sec.id for path, sec in existing.items() if path not in seen_paths]
+    if removed_ids:
+        await session.execute(delete(EvidenceSection).where(EvidenceSection.id.in_(removed_ids)))
+    if unchanged_ids:
+        # created_at doubles as "last fetched" for the TTL check in get_influences
+        await session.execute(
+            update(EvidenceSection).where(EvidenceSection.id.in_(unchanged_ids)).values(created_at=now)
         )
-        rows.append(evidence_section)
     session.add_all(rows)
+
+    page = await _get_page(session, artist_id)
+    if page is None:
+        page = EvidencePage(artist_id=artist_id, source="wikipedia", page_title=revision["title"])
+        session.add(page)
+    page.page_title = revision["title"]
+    page.revid = revision["revid"]
+    page.touched = revision["touched"]
+    page.fetched_at = now
+    page.checked_at = now
+    return len(seen_paths)
+
+async def refresh_wikipedia_sections(
+        session: AsyncSession,
+        artist_id: int,
+        artist_name: str,
+) -> bool:
+    """Re-ingest only if the page's revision moved since the last fetch; returns whether it did.
+
+    Unchanged pages just get their sections' created_at (the TTL clock) bumped.
+    """
+    page = await _get_page(session, artist_id)
+    if page is None or page.revid is None:
+        await store_wikipedia_sections(session, artist_id, artist_name)
+        return True
+
+    try:
+        current = await fetch_wikipedia_revision(page.page_title)
+    except Exception:
+        current = None
+    if current is None or current["revid"] != page.revid:
+        await store_wikipedia_sections(session, artist_id, artist_name)
+        return True
+
+    now = datetime.now(timezone.utc)
+    await session.execute(
+        update(EvidenceSection)
+        .where(EvidenceSection.artist_id == artist_id)
+        .where(EvidenceSection.source == "wikipedia")
+        .values(created_at=now)
+    )
+    page.touched = current["touched"]
+    page.checked_at = now
     await session.commit()
-    return len(sections)    
\ No newline at end of file
+    return False
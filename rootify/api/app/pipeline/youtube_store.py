@@ -1,6 +1,7 @@
 from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.compute import run_io
 from app.models import EvidenceSection
 from app.pipeline.youtube_sections import fetch_youtube_sections
 
@@ -9,7 +10,7 @@ async def store_youtube_sections(
         artist_id: int,
         video_id: str,
 ) -> int:
-    sections = fetch_youtube_sections(video_id)
+    sections = await run_io(fetch_youtube_sections, video_id)
 
     await session.execute(
         delete(EvidenceSection).where((EvidenceSection.artist_id == artist_id) & (EvidenceSection.source == "youtube"))
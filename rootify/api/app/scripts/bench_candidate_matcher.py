@@ -0,0 +1,141 @@
+import argparse
+import random
+import time
+
+from app.pipeline.candidates import (
+    build_seed_index,
+    build_seed_trie,
+    match_seeded_variants,
+    normalize_text,
+)
+
+_VOCAB_COMMON = ["the", "john", "big", "lil", "dj", "young", "mc", "black", "king", "los"]
+_FILLER = (
+    "the band was formed in and later released their debut album which was "
+    "recorded with producer after touring with before signing to a label"
+).split()
+
+
+def _random_word(rng: random.Random) -> str:
+    return "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(3, 8)))
+
+
+def _make_rows(rng: random.Random, n_variants: int) -> list[tuple]:
+    rows = []
+    seen = set()
+    while len(rows) < n_variants:
+        k = rng.choice([1, 2, 2, 2, 3, 3, 4])
+        tokens = []
+        if rng.random() < 0.4:
+            tokens.append(rng.choice(_VOCAB_COMMON))
+        while len(tokens) < k:
+            tokens.append(_random_word(rng))
+        variant_norm = " ".join(tokens)
+        if variant_norm in seen:
+            continue
+        seen.add(variant_norm)
+        canonical = variant_norm.title()
+        rows.append((canonical, variant_norm, tokens[0], len(tokens), len(variant_norm), "seed", "full"))
+    return rows
+
+
+def _make_text(rng: random.Random, rows: list[tuple], n_tokens: int, mention_rate: float) -> str:
+    words = []
+    while len(words) < n_tokens:
+        if rng.random() < mention_rate:
+            words.extend(rng.choice(rows)[1].split())
+        elif rng.random() < 0.2:
+            words.append(rng.choice(_VOCAB_COMMON))
+        else:
+            words.append(rng.choice(_FILLER))
+    return " ".join(words)
+
+
+def _bucket_scan(index, text: str) -> list[tuple[str, str, str]]:
+    # The pre-trie matcher: per-token first-token bucket with a linear tuple compare.
+    doc_tokens = normalize_text(text).split()
+    num_tokens = len(doc_tokens)
+    out = []
+    for i in range(num_tokens):
+        bucket = index.get(doc_tokens[i])
+        if not bucket:
+            continue
+        for entry in bucket:
+            j = i + entry.token_count
+            if j > num_tokens:
+                continue
+            if tuple(doc_tokens[i:j]) == entry.tokens_norm:
+                out.append((entry.canonical_name, " ".join(doc_tokens[i:j]), entry.match_form))
+                break
+    return out
+
+
+def _trie_scan(trie, text: str) -> list[tuple[str, str, str]]:
+    return [
+        (c.influence_artist, c.mention_text, c.match_form)
+        for c in match_seeded_variants(trie, text)
+    ]
+
+
+def _time(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the seeded-variant trie against the first-token bucket scan.",
+    )
+    parser.add_argument("--variants", type=int, default=50_000, help="Number of synthetic name variants.")
+    parser.add_argument("--sections", type=int, default=200, help="Number of synthetic sections.")
+    parser.add_argument("--tokens", type=int, default=800, help="Tokens per section.")
+    parser.add_argument("--mention-rate", type=float, default=0.02, help="Chance of inserting a variant per word.")
+    parser.add_argument("--repeats", type=int, default=3, help="Timing repeats (best is reported).")
+    parser.add_argument("--seed", type=int, default=42)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    rng = random.Random(args.seed)
+
+    rows = _make_rows(rng, args.variants)
+    texts = [_make_text(rng, rows, args.tokens, args.mention_rate) for _ in range(args.sections)]
+
+    t0 = time.perf_counter()
+    index = build_seed_index(rows)
+    t_index = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    trie = build_seed_trie(index)
+    t_trie = time.perf_counter() - t0
+
+    largest = max(len(b) for b in index.values())
+    print(f"variants: {len(rows)} buckets: {len(index)} largest bucket: {largest}")
+    print(f"build: bucket index {t_index * 1000:.1f} ms, trie {t_trie * 1000:.1f} ms (depth {trie.max_depth})")
+
+    mismatches = 0
+    matches = 0
+    for text in texts:
+        a = _bucket_scan(index, text)
+        b = _trie_scan(trie, text)
+        matches += len(a)
+        if a != b:
+            mismatches += 1
+    print(f"matches: {matches} mismatched sections: {mismatches}")
+    if mismatches:
+        raise SystemExit("trie output differs from bucket scan")
+
+    t_bucket = _time(lambda: [_bucket_scan(index, t) for t in texts], args.repeats)
+    t_trie_scan = _time(lambda: [_trie_scan(trie, t) for t in texts], args.repeats)
+    total_tokens = args.sections * args.tokens
+    print(f"bucket scan: {t_bucket * 1000:.1f} ms ({total_tokens / t_bucket:,.0f} tokens/s)")
+    print(f"trie scan:   {t_trie_scan * 1000:.1f} ms ({total_tokens / t_trie_scan:,.0f} tokens/s)")
+    print(f"speedup: {t_bucket / t_trie_scan:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
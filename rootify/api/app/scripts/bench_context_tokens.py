@@ -0,0 +1,81 @@
+import argparse
+import asyncio
+
+from app.db import SessionLocal
+from app.models import Artist
+from app.pipeline.candidates import CONTEXT_SENTENCE_WINDOW, extract_candidates
+from app.pipeline.mlvalidator import make_input_text
+from app.pipeline.scoring.ml_scorer.wikipedia_scorer.registry import get_encoder
+from app.services.evidence_sections import get_evidence_sections
+from sqlalchemy import select
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Count encoder tokens per artist for whole-section vs sentence-window contexts.",
+    )
+    parser.add_argument("--artist-ids", nargs="*", type=int, help="Artists to measure (default: all with sections).")
+    parser.add_argument("--window", type=int, default=max(CONTEXT_SENTENCE_WINDOW, 0), help="Sentence window to compare.")
+    return parser.parse_args()
+
+
+def _count_tokens(tokenizer, texts: list[str], max_len: int) -> tuple[int, int]:
+    raw = 0
+    encoded = 0
+    for t in texts:
+        n = len(tokenizer(t, add_special_tokens=True)["input_ids"])
+        raw += n
+        encoded += min(n, max_len)
+    return raw, encoded
+
+
+async def _measure(artist_ids: list[int] | None, window: int) -> None:
+    encoder = get_encoder()
+    tokenizer = encoder.tokenizer
+    max_len = encoder.max_seq_length
+
+    totals = {"section": [0, 0, 0, 0], "window": [0, 0, 0, 0]}
+    async with SessionLocal() as db:
+        stmt = select(Artist).order_by(Artist.id)
+        if artist_ids:
+            stmt = stmt.where(Artist.id.in_(artist_ids))
+        artists = (await db.execute(stmt)).scalars().all()
+
+        print(f"{'artist':30s} {'inputs':>13s} {'raw tokens':>19s} {'encoded tokens':>19s} {'snippet chars':>21s}")
+        for artist in artists:
+            sections = await get_evidence_sections(artist_id=artist.id, source="wikipedia", db=db)
+            if not sections:
+                continue
+            row = {}
+            for label, ctx in (("section", -1), ("window", window)):
+                inputs = []
+                chars = 0
+                for sec in sections:
+                    for c in await extract_candidates(db, sec.text, context_window=ctx):
+                        inputs.append(make_input_text(artist.name, c.influence_artist, c.snippet))
+                        chars += len(c.snippet)
+                raw, encoded = _count_tokens(tokenizer, inputs, max_len)
+                row[label] = (len(inputs), raw, encoded, chars)
+                for i, v in enumerate(row[label]):
+                    totals[label][i] += v
+            s, w = row["section"], row["window"]
+            print(
+                f"{artist.name[:30]:30s} {s[0]:>6d}/{w[0]:<6d} {s[1]:>9d}/{w[1]:<9d} "
+                f"{s[2]:>9d}/{w[2]:<9d} {s[3]:>10d}/{w[3]:<10d}"
+            )
+
+    s, w = totals["section"], totals["window"]
+    print(f"\ntotal (whole section / window={window}):")
+    print(f"inputs: {s[0]} / {w[0]}")
+    print(f"raw tokens: {s[1]} / {w[1]} ({s[1] / max(w[1], 1):.1f}x)")
+    print(f"encoded tokens (<= {max_len}/input): {s[2]} / {w[2]} ({s[2] / max(w[2], 1):.1f}x)")
+    print(f"snippet chars: {s[3]} / {w[3]} ({s[3] / max(w[3], 1):.1f}x)")
+
+
+def main() -> None:
+    args = _parse_args()
+    asyncio.run(_measure(args.artist_ids, args.window))
+
+
+if __name__ == "__main__":
+    main()
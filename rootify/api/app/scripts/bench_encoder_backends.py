@@ -0,0 +1,88 @@
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.pipeline.scoring.ml_scorer.wikipedia_scorer.onnx_encoder import export_onnx_encoder
+from app.pipeline.scoring.ml_scorer.wikipedia_scorer.registry import (
+    ENCODER_BACKENDS,
+    get_encoder,
+    get_stage1_meta,
+    get_stage1_model,
+)
+
+_SCORER_DIR = os.path.join(os.path.dirname(__file__), "..", "pipeline", "scoring", "ml_scorer", "wikipedia_scorer")
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare torch and ONNX encoder backends on p_valid drift and latency.",
+    )
+    parser.add_argument(
+        "--csv",
+        default=os.path.join(_SCORER_DIR, "wikipedia_testing.csv"),
+        help="CSV with an input_text column.",
+    )
+    parser.add_argument("--backends", nargs="+", default=list(ENCODER_BACKENDS), choices=ENCODER_BACKENDS)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--repeats", type=int, default=3, help="Timing repeats (best is reported).")
+    parser.add_argument("--export", action="store_true", help="(Re)export the ONNX models before benchmarking.")
+    return parser.parse_args()
+
+
+def _time_encode(encoder, texts, batch_size: int, repeats: int) -> tuple[np.ndarray, float]:
+    emb = encoder.encode(texts, batch_size=batch_size, show_progress_bar=False)
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        encoder.encode(texts, batch_size=batch_size, show_progress_bar=False)
+        best = min(best, time.perf_counter() - t0)
+    return np.asarray(emb, dtype=np.float32), best
+
+
+def main() -> None:
+    args = _parse_args()
+    encoder_name = get_stage1_meta().get("encoder", "all-MiniLM-L6-v2")
+    if args.export:
+        export_onnx_encoder(encoder_name, quantize=False)
+        export_onnx_encoder(encoder_name, quantize=True)
+
+    texts = pd.read_csv(args.csv)["input_text"].astype(str).tolist()
+    stage1 = get_stage1_model()
+    t_junk = float(get_stage1_meta().get("T_junk", 0.6))
+
+    results = {}
+    for backend in args.backends:
+        t0 = time.perf_counter()
+        encoder = get_encoder(encoder_name, backend=backend)
+        load_s = time.perf_counter() - t0
+        emb, best = _time_encode(encoder, texts, args.batch_size, args.repeats)
+        p = stage1.predict_proba(emb)[:, 1]
+        results[backend] = (emb, p)
+        print(
+            f"{backend:10s} load {load_s:6.2f}s | encode {best * 1000:8.1f} ms "
+            f"| {len(texts) / best:8.1f} texts/s | {best * 1000 / len(texts):6.2f} ms/text"
+        )
+
+    if "torch" not in results:
+        return
+    ref_emb, ref_p = results["torch"]
+    print(f"\np_valid drift vs torch on {len(texts)} rows (T_junk={t_junk}):")
+    for backend, (emb, p) in results.items():
+        if backend == "torch":
+            continue
+        cos = np.sum(emb * ref_emb, axis=1) / (
+            np.linalg.norm(emb, axis=1) * np.linalg.norm(ref_emb, axis=1) + 1e-12
+        )
+        drift = np.abs(p - ref_p)
+        flips = int(np.sum((p >= t_junk) != (ref_p >= t_junk)))
+        print(
+            f"{backend:10s} min cos {cos.min():.5f} | max |dp| {drift.max():.5f} "
+            f"| mean |dp| {drift.mean():.5f} | gate flips {flips}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+import argparse
+import time
+
+from app.pipeline.influence_rules import (
+    _CUE_RE,
+    _MATCHER,
+    _REVERSE_INFLUENCE,
+    PATTERN_SPECS,
+    InfluenceMatch,
+)
+from app.scripts.influence_rules_regression import _DATA_CSV, _RX
+
+import pandas as pd
+
+
+def _sequential_match(sentence: str) -> InfluenceMatch | None:
+    # The pre-compiled path: reverse guard, then each spec in priority order.
+    if _REVERSE_INFLUENCE.search(sentence):
+        return None
+    for pat in PATTERN_SPECS:
+        m = pat.regex.search(sentence)
+        if m:
+            return InfluenceMatch(
+                label=pat.label,
+                direction=pat.direction,
+                start=m.start(),
+                end=m.end(),
+                can_fallback=pat.can_fallback and pat.label != "weak",
+            )
+    return None
+
+
+def _sequential_path(sentence: str) -> InfluenceMatch | None:
+    # what _extract_from_doc did per sentence: cue prefilter, then the per-spec loop
+    if not _CUE_RE.search(sentence):
+        return None
+    return _sequential_match(sentence)
+
+
+def _matcher_path(sentence: str) -> InfluenceMatch | None:
+    cues = _MATCHER.cues(sentence)
+    if not cues:
+        return None
+    return _MATCHER.match(sentence, cues)
+
+
+def _load_sentences(path: str) -> list[str]:
+    df = pd.read_csv(path, names=["id", "input_text", "label", "bucket"])
+    out = []
+    for input_text in df["input_text"].astype(str):
+        m = _RX.match(input_text)
+        if m:
+            out.append(m.group(3).strip())
+    return out
+
+
+def _time(fn, sentences: list[str], repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        for s in sentences:
+            fn(s)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Microbenchmark the cue-dispatched influence matcher against the per-spec loop.",
+    )
+    parser.add_argument("--csv", default=_DATA_CSV)
+    parser.add_argument("--repeats", type=int, default=20)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    sentences = _load_sentences(args.csv)
+
+    mismatches = [s for s in sentences if _sequential_path(s) != _matcher_path(s)]
+    matched = sum(1 for s in sentences if _matcher_path(s))
+    print(f"sentences: {len(sentences)} matched: {matched} mismatches: {len(mismatches)}")
+    for s in mismatches[:5]:
+        print("  ", s[:120])
+    if mismatches:
+        raise SystemExit("cue-dispatched matcher differs from the per-spec loop")
+
+    # sentences without a cue word never reach either matcher in _extract_from_doc,
+    # so the per-group numbers only count the ones that pass the prefilter
+    cued = [s for s in sentences if _CUE_RE.search(s)]
+    groups = [
+        ("all", sentences),
+        ("cued", cued),
+        ("cued matching", [s for s in cued if _sequential_match(s)]),
+        ("cued no match", [s for s in cued if not _sequential_match(s)]),
+    ]
+    for name, group in groups:
+        if not group:
+            continue
+        t_seq = _time(_sequential_path, group, args.repeats)
+        t_comp = _time(_matcher_path, group, args.repeats)
+        per = 1e6 / len(group)
+        print(
+            f"{name:13s} n={len(group):4d} | cue + per-spec loop {t_seq * per:6.1f} us/sentence "
+            f"| cue dispatch {t_comp * per:6.1f} us/sentence | speedup {t_seq / t_comp:.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
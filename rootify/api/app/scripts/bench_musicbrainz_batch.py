@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import json
+import time
+
+import app.services.musicbrainz as musicbrainz
+import app.services.musicbrainz_local as musicbrainz_local
+
+# seeded artists plus the kind of non-artist PERSON/ORG names NER hands to the resolver
+_DEFAULT_NAMES = [
+    "Radiohead", "Björk", "Bjork", "Kate Bush", "Aphex Twin", "Joni Mitchell", "Talking Heads",
+    "Nirvana", "The Beatles", "Kraftwerk", "Can", "Brian Eno", "Cocteau Twins", "MF DOOM",
+    "J Dilla", "Sun Ra", "Nina Simone", "Boards of Canada", "Portishead", "Ye",
+    "BBC Radio 1", "Rolling Stone", "Pitchfork", "Grammy Awards", "Columbia Records",
+    "Glastonbury Festival", "Oxford", "Abbey Road Studios", "NME", "John Peel",
+    "Thom Yorke", "Nigel Godrich", "Geoff Travis", "Steve Albini", "Tony Wilson",
+]
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Resolve names against the live MusicBrainz API one query per name vs OR'd batches (cold caches).",
+    )
+    parser.add_argument("names", nargs="*", default=_DEFAULT_NAMES)
+    parser.add_argument("--names-file", help="one name per line; replaces the positional names")
+    parser.add_argument("--max-names", type=int, default=musicbrainz.MB_BATCH_MAX_NAMES, help="names per batch")
+    parser.add_argument("--skip-unbatched", action="store_true", help="only run the batched pass")
+    return parser.parse_args()
+
+
+async def _resolve(names: list[str], max_names: int) -> dict:
+    musicbrainz.MB_BATCH_MAX_NAMES = max_names
+    musicbrainz._name_to_mbid.clear()
+    musicbrainz._search_batcher = musicbrainz._SearchBatcher()
+    requests0 = musicbrainz._mb_requests
+    t0 = time.perf_counter()
+    mbids = await musicbrainz.fetch_mbids_cached(names)
+    return {
+        "elapsed_s": round(time.perf_counter() - t0, 2),
+        "requests": musicbrainz._mb_requests - requests0,
+        "resolved": sum(1 for mbid in mbids.values() if mbid),
+        "batches": musicbrainz._search_batcher.stats(),
+        "mbids": mbids,
+    }
+
+
+async def _run(args: argparse.Namespace, names: list[str]) -> dict:
+    # the offline index would answer before any request is made
+    musicbrainz_local.MB_LOCAL_INDEX_PATH = None
+    musicbrainz_local._local_index = None
+
+    report = {"names": len(names)}
+    batched = await _resolve(names, args.max_names)
+    if not args.skip_unbatched:
+        single = await _resolve(names, 1)
+        report["unbatched"] = {k: v for k, v in single.items() if k not in ("mbids", "batches")}
+        report["differences"] = {
+            name: {"unbatched": single["mbids"][name], "batched": batched["mbids"][name]}
+            for name in names
+            if single["mbids"][name] != batched["mbids"][name]
+        }
+    report["batched"] = {k: v for k, v in batched.items() if k != "mbids"}
+    return report
+
+
+def main() -> None:
+    args = _parse_args()
+    names = args.names
+    if args.names_file:
+        with open(args.names_file, "r", encoding="utf-8") as f:
+            names = [line.strip() for line in f if line.strip()]
+    print(json.dumps(asyncio.run(_run(args, names)), indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
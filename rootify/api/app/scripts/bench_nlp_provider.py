@@ -0,0 +1,102 @@
+import argparse
+import json
+import subprocess
+import sys
+import time
+
+from app.pipeline.nlp import NLP_PROFILES, SPACY_MODEL, get_nlp, parse_many, profile_disable
+from app.scripts.influence_rules_regression import _DATA_CSV, load_corpus
+
+
+def _rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _child(mode: str) -> None:
+    # one measurement per fresh interpreter so RSS is not polluted by the other mode
+    import spacy
+
+    base = _rss_mb()
+    t0 = time.perf_counter()
+    if mode == "per-module":
+        # what candidates.py and influence_rules.py used to do at import time
+        spacy.load(SPACY_MODEL)
+        spacy.load(SPACY_MODEL)
+    else:
+        get_nlp()
+    print(json.dumps({"load_s": time.perf_counter() - t0, "rss_mb": _rss_mb(), "base_rss_mb": base}))
+
+
+def _measure_load(mode: str) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-m", "app.scripts.bench_nlp_provider", "--child", mode],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def _signature(doc) -> tuple:
+    # the "ner" profile sets no sentence boundaries, so doc.sents would raise
+    sents = doc.sents if doc.has_annotation("SENT_START") else ()
+    return (
+        tuple((s.start_char, s.end_char) for s in sents),
+        tuple((e.start_char, e.end_char, e.label_) for e in doc.ents),
+    )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Compare spaCy cold start/RSS (per-module vs shared) and per-profile parse speed.",
+    )
+    parser.add_argument("--csv", default=_DATA_CSV)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--child", choices=("per-module", "shared"), help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    if args.child:
+        _child(args.child)
+        return
+
+    print(f"model: {SPACY_MODEL}")
+    for mode in ("per-module", "shared"):
+        r = _measure_load(mode)
+        print(
+            f"{mode:10s} load {r['load_s']:6.2f}s | rss {r['rss_mb']:7.1f} MB "
+            f"(+{r['rss_mb'] - r['base_rss_mb']:.1f} MB over bare spacy import)"
+        )
+
+    texts = [item["text"] for item in load_corpus(args.csv)]
+    n_chars = sum(len(t) for t in texts)
+    get_nlp()
+    reference = None
+    print(f"\nparsing {len(texts)} sections / {n_chars} chars")
+    for profile in NLP_PROFILES:
+        best = float("inf")
+        docs = []
+        for _ in range(args.repeats):
+            t0 = time.perf_counter()
+            docs = list(parse_many(texts, profile))
+            best = min(best, time.perf_counter() - t0)
+        sigs = [_signature(d) for d in docs]
+        if reference is None:
+            reference = sigs
+        same_sents = sum(a[0] == b[0] for a, b in zip(sigs, reference))
+        same_ents = sum(a[1] == b[1] for a, b in zip(sigs, reference))
+        print(
+            f"{profile:17s} {best:6.2f}s | {n_chars / best / 1000:7.1f} kchars/s "
+            f"| sents == full {same_sents}/{len(docs)} | ents == full {same_ents}/{len(docs)} "
+            f"| skips {','.join(profile_disable(profile)) or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+import argparse
+import asyncio
+import json
+import time
+
+import app.pipeline.wiki_fetch as wiki_fetch
+import app.pipeline.wiki_sections as wiki_sections
+from app.pipeline.wiki_fetch import FixtureTransport, MediaWikiClient
+from app.pipeline.wiki_sections import select_relevant_sections
+
+_DEFAULT_TITLES = [
+    "Radiohead",
+    "Björk",
+    "Kendrick Lamar",
+    "Joni Mitchell",
+    "Aphex Twin",
+    "Nirvana (band)",
+    "Beyoncé",
+    "Talking Heads",
+]
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Time Wikipedia fetches with the pooled MediaWiki client (vs wikipediaapi, or per-section bytes).",
+    )
+    parser.add_argument("titles", nargs="*", default=_DEFAULT_TITLES)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--fixtures", help="replay responses from this directory instead of the live API")
+    parser.add_argument("--record", action="store_true", help="with --fixtures: fetch and save missing responses")
+    parser.add_argument("--baseline", action="store_true", help="also time the old per-call wikipediaapi fetch")
+    parser.add_argument(
+        "--bytes",
+        action="store_true",
+        help="report bytes transferred per artist: whole extract vs table of contents + selected sections",
+    )
+    return parser.parse_args()
+
+
+def _baseline(titles: list[str]) -> dict:
+    import wikipediaapi
+
+    t0 = time.perf_counter()
+    sections = {}
+    for title in titles:
+        wiki = wikipediaapi.Wikipedia(
+            user_agent="Rootify/0.1 (contact: dev@rootify.local)",
+            language="en",
+            extract_format=wikipediaapi.ExtractFormat.WIKI,
+        )
+        page = wiki.page(title)
+        if page.exists():
+            sections[title] = select_relevant_sections(page)
+    return {"elapsed_s": time.perf_counter() - t0, "sections": sections}
+
+
+async def _run(args: argparse.Namespace) -> dict:
+    transport = FixtureTransport(args.fixtures, record=args.record) if args.fixtures else None
+    client = MediaWikiClient(max_concurrency=args.concurrency, transport=transport)
+    t0 = time.perf_counter()
+    pages = await asyncio.gather(*(client.fetch_page(t) for t in args.titles))
+    elapsed = time.perf_counter() - t0
+    await client.aclose()
+
+    sections = {t: select_relevant_sections(p) for t, p in zip(args.titles, pages) if p is not None}
+    return {"elapsed_s": elapsed, "sections": sections, "stats": client.stats()}
+
+
+async def _bytes_per_artist(args: argparse.Namespace) -> list[dict]:
+    transport = FixtureTransport(args.fixtures, record=args.record) if args.fixtures else None
+    client = MediaWikiClient(max_concurrency=args.concurrency, transport=transport)
+    wiki_fetch._client = client
+
+    rows = []
+    for title in args.titles:
+        row = {"title": title}
+        for mode in ("full", "sections"):
+            wiki_sections.WIKI_FETCH_MODE = mode
+            bytes0, requests0 = client.bytes_received, client.requests
+            t0 = time.perf_counter()
+            try:
+                sections, _ = await wiki_sections.fetch_relevant_sections(title)
+            except ValueError:
+                sections = []
+            row[mode] = {
+                "bytes": client.bytes_received - bytes0,
+                "requests": client.requests - requests0,
+                "elapsed_s": round(time.perf_counter() - t0, 3),
+                "sections": len(sections),
+                "fallback": any(s["keyword"] == "FALLBACK_FULL_PAGE" for s in sections),
+            }
+        if row["full"]["bytes"]:
+            row["saved_pct"] = round(100 * (1 - row["sections"]["bytes"] / row["full"]["bytes"]), 1)
+        rows.append(row)
+    await client.aclose()
+    return rows
+
+
+def main() -> None:
+    args = _parse_args()
+    if args.bytes:
+        rows = asyncio.run(_bytes_per_artist(args))
+        full = sum(r["full"]["bytes"] for r in rows)
+        sections = sum(r["sections"]["bytes"] for r in rows)
+        print(json.dumps({"artists": rows, "total_full_bytes": full, "total_sections_bytes": sections}, indent=2))
+        return
+    result = asyncio.run(_run(args))
+    report = {
+        "pages": len(args.titles),
+        "found": len(result["sections"]),
+        "async_s": round(result["elapsed_s"], 3),
+        **result["stats"],
+    }
+    if args.baseline:
+        base = _baseline(args.titles)
+        report["baseline_s"] = round(base["elapsed_s"], 3)
+        # same extract parser as wikipediaapi, so section texts must match exactly
+        report["sections_identical"] = base["sections"] == result["sections"]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
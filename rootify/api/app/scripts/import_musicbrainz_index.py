@@ -0,0 +1,52 @@
+import argparse
+import json
+import os
+import time
+
+from app.services.musicbrainz_local import (
+    MB_DUMP_SAMPLE,
+    MB_LOCAL_INDEX_PATH,
+    LocalArtistIndex,
+    build_local_index,
+)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Build the offline MusicBrainz artist index from mbdump.tar.bz2 or a directory of artist/artist_alias files.",
+    )
+    parser.add_argument("source", nargs="?", default=MB_DUMP_SAMPLE)
+    parser.add_argument("--out", default=MB_LOCAL_INDEX_PATH or "mb_local_index.sqlite3")
+    parser.add_argument("--bench", type=int, default=10000, help="timed lookups against the new index (0 to skip)")
+    return parser.parse_args()
+
+
+def _bench(path: str, n: int) -> dict:
+    index = LocalArtistIndex(path)
+    names = [row[0] for row in index._conn.execute("SELECT name FROM artist LIMIT 1000")]
+    mbids = [row[0] for row in index._conn.execute("SELECT mbid FROM artist LIMIT 1000")]
+    if not names:
+        return {}
+    t0 = time.perf_counter()
+    for i in range(n):
+        index.lookup_mbid(names[i % len(names)])
+    by_name = (time.perf_counter() - t0) / n
+    t0 = time.perf_counter()
+    for i in range(n):
+        index.canonical_name(mbids[i % len(mbids)])
+    by_mbid = (time.perf_counter() - t0) / n
+    return {"name_to_mbid_us": round(by_name * 1e6, 1), "mbid_to_name_us": round(by_mbid * 1e6, 1)}
+
+
+def main() -> None:
+    args = _parse_args()
+    stats = build_local_index(args.source, args.out)
+    stats["out"] = os.path.abspath(args.out)
+    stats["size_mb"] = round(os.path.getsize(args.out) / 1e6, 1)
+    if args.bench:
+        stats.update(_bench(args.out, args.bench))
+    print(json.dumps(stats, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+import argparse
+import json
+import os
+import re
+import time
+
+import pandas as pd
+
+import app.pipeline.influence_rules as influence_rules
+from app.pipeline.influence_rules import extract_influence_candidates, extract_influence_candidates_batch
+
+_DATA_CSV = os.path.join(
+    os.path.dirname(__file__), "..", "pipeline", "scoring", "ml_scorer", "wikipedia_data.csv"
+)
+_RX = re.compile(r"\[SUBJECT\]\s*(.*?)\s*\[CANDIDATE\]\s*(.*?)\s*\[CONTEXT\]\s*(.*)$", re.DOTALL)
+
+
+def load_corpus(path: str = _DATA_CSV) -> list[dict]:
+    """Rebuild pseudo-sections from wikipedia_data.csv: one per subject, one paragraph per context in order.
+
+    Most contexts carry a cue word and some do not, so the paragraph prefilter
+    drops real paragraphs here; compare against a ``--no-prefilter`` snapshot
+    to check that it never drops a candidate.
+    """
+    df = pd.read_csv(path, names=["id", "input_text", "label", "bucket"])
+    by_subject: dict[str, list[str]] = {}
+    for input_text in df["input_text"].astype(str):
+        m = _RX.match(input_text)
+        if not m:
+            continue
+        subject, _, context = (g.strip() for g in m.groups())
+        contexts = by_subject.setdefault(subject, [])
+        if context not in contexts:
+            contexts.append(context)
+    return [
+        {"subject": subject, "section_path": f"regression > {subject}", "text": "\n".join(contexts)}
+        for subject, contexts in by_subject.items()
+    ]
+
+
+def run_corpus(corpus: list[dict], batch_size: int | None = None, n_process: int = 1) -> list[dict]:
+    if batch_size:
+        batches = extract_influence_candidates_batch(
+            ((item["text"], item["section_path"], item["subject"]) for item in corpus),
+            batch_size=batch_size,
+            n_process=n_process,
+        )
+        return [{"subject": item["subject"], "candidates": cands} for item, cands in zip(corpus, batches)]
+    return [
+        {
+            "subject": item["subject"],
+            "candidates": extract_influence_candidates(item["text"], item["section_path"], item["subject"]),
+        }
+        for item in corpus
+    ]
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Run extract_influence_candidates over the wikipedia_data.csv corpus. "
+            "Write a snapshot with --write on a known-good revision, then compare later revisions against it. "
+            "A snapshot written with --no-prefilter checks that the paragraph prefilter loses nothing."
+        ),
+    )
+    parser.add_argument("snapshot", help="Path of the JSON snapshot to write or compare against.")
+    parser.add_argument("--write", action="store_true", help="Write the snapshot instead of comparing.")
+    parser.add_argument("--csv", default=_DATA_CSV)
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Use extract_influence_candidates_batch with this nlp.pipe batch size (default: one section at a time).",
+    )
+    parser.add_argument("--n-process", type=int, default=1, help="nlp.pipe worker processes (with --batch-size).")
+    parser.add_argument(
+        "--no-prefilter",
+        action="store_true",
+        help="Parse whole sections instead of only their cue paragraphs.",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    if args.no_prefilter:
+        influence_rules.INFLUENCE_PARAGRAPH_PREFILTER = False
+        # spawned nlp.pipe workers re-import the module and read the environment
+        os.environ["INFLUENCE_PARAGRAPH_PREFILTER"] = "0"
+    corpus = load_corpus(args.csv)
+
+    t0 = time.perf_counter()
+    results = run_corpus(corpus, args.batch_size, args.n_process)
+    elapsed = time.perf_counter() - t0
+    n_chars = sum(len(item["text"]) for item in corpus)
+    n_cands = sum(len(r["candidates"]) for r in results)
+    print(f"sections: {len(corpus)} chars: {n_chars} candidates: {n_cands} time: {elapsed:.2f}s")
+
+    if args.write:
+        with open(args.snapshot, "w") as f:
+            json.dump(results, f, indent=1)
+        print("wrote", args.snapshot)
+        return
+
+    with open(args.snapshot, "r") as f:
+        expected = json.load(f)
+    diffs = 0
+    for exp, got in zip(expected, results):
+        if exp != got:
+            diffs += 1
+            print(f"DIFF {got['subject']}")
+            exp_set = {json.dumps(c, sort_keys=True) for c in exp["candidates"]}
+            got_set = {json.dumps(c, sort_keys=True) for c in got["candidates"]}
+            for c in sorted(exp_set - got_set):
+                print("  -", c)
+            for c in sorted(got_set - exp_set):
+                print("  +", c)
+    if len(expected) != len(results):
+        diffs += 1
+        print(f"section count changed: {len(expected)} -> {len(results)}")
+    if diffs:
+        raise SystemExit(f"{diffs} sections differ from snapshot")
+    print("identical to snapshot")
+
+
+if __name__ == "__main__":
+    main()
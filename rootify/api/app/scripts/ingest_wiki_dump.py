@@ -0,0 +1,64 @@
+import argparse
+import asyncio
+import json
+import time
+
+from app.pipeline.wiki_dump import (
+    WIKI_DUMP_COMMIT_EVERY,
+    WIKI_DUMP_SAMPLE,
+    ArtistTitleIndex,
+    ingest_wiki_dump,
+    iter_matched_sections,
+)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Backfill Wikipedia EvidenceSection rows from a local pages-articles dump (no live API calls).",
+    )
+    parser.add_argument("dump", nargs="?", default=WIKI_DUMP_SAMPLE, help="pages-articles*.xml.bz2 or a prefiltered .xml")
+    parser.add_argument("--limit", type=int, help="stop after this many main-namespace pages")
+    parser.add_argument("--commit-every", type=int, default=WIKI_DUMP_COMMIT_EVERY)
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="parse, match and split only; match against --artist names instead of the database",
+    )
+    parser.add_argument("--artist", action="append", default=[], help="artist name for --dry-run (repeatable)")
+    return parser.parse_args()
+
+
+def _dry_run(args: argparse.Namespace) -> dict:
+    index = ArtistTitleIndex(enumerate(args.artist, start=1))
+    stats = {"artists": len(index)}
+    sections = {}
+    t0 = time.perf_counter()
+    for artist_id, secs, revision in iter_matched_sections(args.dump, index, stats, limit=args.limit):
+        sections[args.artist[artist_id - 1]] = {
+            "page": revision["title"],
+            "revid": revision["revid"],
+            "sections": [s["section_path"] for s in secs],
+        }
+    elapsed = time.perf_counter() - t0
+    stats["elapsed_s"] = round(elapsed, 3)
+    stats["pages_per_s"] = round(stats["pages_scanned"] / elapsed, 1) if elapsed else 0.0
+    stats["matched"] = sections
+    return stats
+
+
+async def _ingest(args: argparse.Namespace) -> dict:
+    # imported here so --dry-run works without DATABASE_URL
+    from app.db import SessionLocal
+
+    async with SessionLocal() as db:
+        return await ingest_wiki_dump(db, args.dump, commit_every=args.commit_every, limit=args.limit)
+
+
+def main() -> None:
+    args = _parse_args()
+    stats = _dry_run(args) if args.dry_run else asyncio.run(_ingest(args))
+    print(json.dumps(stats, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
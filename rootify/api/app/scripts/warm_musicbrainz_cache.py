@@ -0,0 +1,33 @@
+import argparse
+import asyncio
+import json
+import time
+
+from app.db import SessionLocal
+from app.services.musicbrainz import warm_musicbrainz_cache
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Resolve every ArtistNameVariant canonical name into the shared MusicBrainz cache table.",
+    )
+    parser.add_argument("--batch-size", type=int, default=50, help="names resolved (and flushed) per round")
+    parser.add_argument("--limit", type=int, help="only warm the first N canonical names")
+    return parser.parse_args()
+
+
+async def _warm(args: argparse.Namespace) -> dict:
+    async with SessionLocal() as db:
+        t0 = time.perf_counter()
+        stats = await warm_musicbrainz_cache(db, batch_size=args.batch_size, limit=args.limit)
+    stats["elapsed_s"] = round(time.perf_counter() - t0, 1)
+    return stats
+
+
+def main() -> None:
+    args = _parse_args()
+    print(json.dumps(asyncio.run(_warm(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,11 @@
-from app.pipeline.influence_rules import extract_influence_candidates
+from app.pipeline.influence_rules import extract_influence_candidates_async
 from app.services.evidence_sections import get_evidence_sections
-from app.pipeline.claims_store import replace_claims_for_artist
+from app.pipeline.claims_store import replace_claims_for_artist, replace_claims_for_sections
+from app.pipeline.nlp_annotations import text_hash
+from app.services.constants import CURRENT_EXTRACTION_VERSION
 from app.pipeline.scoring.heuristic import HeuristicScorer
 from app.pipeline.wikidata_fetch import fetch_wikidata_qid, fetch_wikidata_influences
-from app.pipeline.scoring.ml_scorer.wikipedia_scorer.two_stage_wikipedia_scorer import ml_score_wikipedia
+from app.pipeline.scoring.ml_scorer.wikipedia_scorer.two_stage_wikipedia_scorer import ml_score_wikipedia_batched
 from app.pipeline.candidates import extract_candidates
 from app.models import Artist
 from app.pipeline.mlvalidator import make_input_text
@@ -29,9 +31,21 @@ async def extract_and_store_wikipedia_claims(db, artist_id):
 
     sections = await get_evidence_sections(artist_id=artist_id, source="wikipedia", db=db)
 
+    # only sections that are new, changed or extracted under an older version are re-run;
+    # claims of the rest are kept as they are
+    stale = []
+    kept_sections = []
+    for sec in sections:
+        if sec.text_hash is None:
+            sec.text_hash = text_hash(sec.text)
+        if sec.extraction_version == CURRENT_EXTRACTION_VERSION:
+            kept_sections.append((sec.section_path, sec.text_hash))
+        else:
+            stale.append(sec)
+
     candidates = []
     artist_name_norm = _normalize_name(artist_name)
-    for sec in sections:
+    for sec in stale:
         raw_candidates = await extract_candidates(db, sec.text)
         for raw_candidate in raw_candidates:
             if _normalize_name(raw_candidate.influence_artist) == artist_name_norm:
@@ -40,6 +54,7 @@ async def extract_and_store_wikipedia_claims(db, artist_id):
                 "influence_artist": raw_candidate.influence_artist,
                 "pattern_type": raw_candidate.candidate_method,
                 "section_path": sec.section_path,
+                "section_hash": sec.text_hash,
                 "snippet": raw_candidate.snippet,
             }
             candidates.append(candidate)
@@ -48,16 +63,19 @@ async def extract_and_store_wikipedia_claims(db, artist_id):
     for candidate in candidates:
         ml_input.append(make_input_text(artist_name, candidate["influence_artist"], candidate["snippet"]))
     if ml_input:
-        ml_scores = ml_score_wikipedia(ml_input)
+        ml_scores = await ml_score_wikipedia_batched(ml_input)
         if len(ml_scores) != len(candidates):
-            raise RuntimeError("ml_score_wikipedia returned wrong number of scores")
+            raise RuntimeError("ml_score_wikipedia_batched returned wrong number of scores")
         for candidate, prob_dict in zip(candidates, ml_scores):
             candidate["claim_probability"] = prob_dict.get("p_valid", 0.0)
 
-    await replace_claims_for_artist(
+    for sec in stale:
+        sec.extraction_version = CURRENT_EXTRACTION_VERSION
+    await replace_claims_for_sections(
         db=db,
         artist_id=artist_id,
         source="wikipedia",
+        kept_sections=kept_sections,
         claims=candidates,
     )
     
@@ -65,6 +83,7 @@ async def extract_and_store_wikipedia_claims(db, artist_id):
         "artist_id": artist_id,
         "source": "wikipedia",
         "sections_used": len(sections),
+        "sections_extracted": len(stale),
         "claims_extracted": len(candidates),
     }
 
@@ -108,8 +127,8 @@ async def extract_and_store_youtube_claims(db, artist_id):
     candidates = []
     artist = await db.get(Artist, artist_id)
     artist_name_norm = _normalize_name(artist.name if artist else "")
-    for sec in sections:
-        raw_candidates = extract_influence_candidates(sec.text, sec.section_path)
+    batches = await extract_influence_candidates_async(((sec.text, sec.section_path, None) for sec in sections), db=db)
+    for raw_candidates in batches:
         for candidate in raw_candidates:
             if _normalize_name(candidate.get("influence_artist")) == artist_name_norm:
                 continue
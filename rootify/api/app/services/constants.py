@@ -1,4 +1,4 @@
-CURRENT_EXTRACTION_VERSION = "v4.3"
+CURRENT_EXTRACTION_VERSION = "v4.6"
 
 YOUTUBE_ARTIST_SEED = [
     # Rock / Alternative / Indie
@@ -1,4 +1,4 @@
-from app.pipeline.influence_rules import extract_influence_candidates
+from app.pipeline.influence_rules import extract_influence_candidates_async
 from app.services.evidence_sections import get_evidence_sections
 from app.pipeline.wiki_store import store_wikipedia_sections
 from app.models import Artist
@@ -12,8 +12,11 @@ async def generate_dataset_for_artist(db, artist_id):
     sections = await get_evidence_sections(artist_id=artist_id, source="wikipedia", db=db)
 
     candidates = []
-    for sec in sections:
-        candidates.extend(extract_influence_candidates(sec.text, sec.section_path, artist_name))
+    for sec_candidates in await extract_influence_candidates_async(
+        ((sec.text, sec.section_path, artist_name) for sec in sections),
+        db=db,
+    ):
+        candidates.extend(sec_candidates)
 
     input_texts = []
     if not artist:
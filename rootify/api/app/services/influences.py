@@ -2,7 +2,7 @@ from sqlalchemy import select, func
 from fastapi import HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import Artist, EvidenceSection, EvidenceClaim
-from app.pipeline.wiki_store import store_wikipedia_sections
+from app.pipeline.wiki_store import refresh_wikipedia_sections
 from app.services.constants import CURRENT_EXTRACTION_VERSION
 from app.services.claims import extract_and_store_wikipedia_claims
 from app.services.claims import extract_and_store_wikidata_claims
@@ -66,7 +66,10 @@ async def get_influences(
     artist_name = artist.name
 
     if status_dict["needs_ingest"]:
-        await store_wikipedia_sections(db, artist_id, artist.name)
+        page_changed = await refresh_wikipedia_sections(db, artist_id, artist.name)
+        if not page_changed and source == "wikipedia":
+            # same revision as last time: evidence is unchanged, so only a rules bump needs extraction
+            status_dict["needs_extract"] = claims_version_stored != CURRENT_EXTRACTION_VERSION
 
     if status_dict["needs_extract"]:
         if source == "wikipedia":
@@ -1,7 +1,8 @@
 import os
 import json
 import boto3
-import anyio
+
+from app.compute import run_io
 
 AWS_REGION = os.getenv("AWS_REGION")
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
@@ -36,6 +37,6 @@ def _invoke_sync(payload: dict):
 
 async def invoke_artifact_writer(payload: dict):
     try:
-        await anyio.to_thread.run_sync(_invoke_sync, payload)
+        await run_io(_invoke_sync, payload)
     except Exception:
         return
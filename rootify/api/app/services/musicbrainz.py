@@ -1,9 +1,23 @@
 import asyncio
+import logging
+import os
+import re
+import sys
 import time
+from collections import OrderedDict
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from typing import Optional
 
 import httpx
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import ArtistNameVariant, MusicBrainzCacheEntry
+from app.services.musicbrainz_local import MB_LOCAL_HTTP_FALLBACK, get_local_index, normalize_mb_name
+
+logger = logging.getLogger(__name__)
 
 MB_BASE = "https://musicbrainz.org/ws/2"
 MB_HEADERS = {
@@ -28,15 +42,140 @@ class CacheItem:
     value: Optional[str]
     expires_at: float
 
-_name_to_mbid: dict[str, CacheItem] = {}
-_mbid_to_name: dict[str, CacheItem] = {}
-
-_in_flight_name: dict[str, asyncio.Future] = {}
-_in_flight_mbid: dict[str, asyncio.Future] = {}
-
-_cache_lock = asyncio.Lock()
+MB_CACHE_MAX_ENTRIES = int(os.getenv("MB_CACHE_MAX_ENTRIES", "100000"))
+MB_CACHE_MAX_MB = float(os.getenv("MB_CACHE_MAX_MB", "64"))
+MB_CACHE_SHARDS = int(os.getenv("MB_CACHE_SHARDS", "16"))
+MB_CACHE_SWEEP_SEC = float(os.getenv("MB_CACHE_SWEEP_SEC", "300"))
+# unflushed L2 writes kept for the next flush; the oldest are dropped beyond this
+MB_PENDING_L2_MAX = int(os.getenv("MB_PENDING_L2_MAX", "10000"))
+
+# OrderedDict node + CacheItem + float, roughly
+_ENTRY_OVERHEAD_BYTES = 160
+
+
+class _CacheShard:
+    def __init__(self) -> None:
+        self.items: OrderedDict[str, CacheItem] = OrderedDict()
+        self.in_flight: dict[str, asyncio.Future] = {}
+        self.lock = asyncio.Lock()
+        self.bytes = 0
+
+
+class BoundedTTLCache:
+    """LRU + TTL map of key -> CacheItem, split into shards that each own a lock and a size budget.
+
+    ``get`` only returns unexpired items and drops expired ones it runs into;
+    ``sweep`` removes the rest in the background.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int = MB_CACHE_MAX_ENTRIES,
+        max_bytes: int = int(MB_CACHE_MAX_MB * 1024 * 1024),
+        shards: int = MB_CACHE_SHARDS,
+    ) -> None:
+        self.name = name
+        self._shards = [_CacheShard() for _ in range(max(1, shards))]
+        self._max_entries = max(1, max_entries // len(self._shards))
+        self._max_bytes = max(1, max_bytes // len(self._shards))
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def _shard(self, key: str) -> _CacheShard:
+        return self._shards[hash(key) % len(self._shards)]
+
+    def lock(self, key: str) -> asyncio.Lock:
+        return self._shard(key).lock
+
+    def in_flight(self, key: str) -> dict[str, asyncio.Future]:
+        return self._shard(key).in_flight
+
+    @staticmethod
+    def _size(key: str, item: CacheItem) -> int:
+        return sys.getsizeof(key) + sys.getsizeof(item.value) + _ENTRY_OVERHEAD_BYTES
+
+    def peek(self, key: str, now: float | None = None) -> CacheItem | None:
+        """Unexpired item without touching LRU order or counters."""
+        item = self._shard(key).items.get(key)
+        if item is None or item.expires_at <= (now if now is not None else _now()):
+            return None
+        return item
+
+    def get(self, key: str, now: float | None = None) -> CacheItem | None:
+        shard = self._shard(key)
+        item = shard.items.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+        if item.expires_at <= (now if now is not None else _now()):
+            del shard.items[key]
+            shard.bytes -= self._size(key, item)
+            self.expired += 1
+            self.misses += 1
+            return None
+        shard.items.move_to_end(key)
+        self.hits += 1
+        return item
+
+    def set(self, key: str, item: CacheItem) -> None:
+        shard = self._shard(key)
+        old = shard.items.pop(key, None)
+        if old is not None:
+            shard.bytes -= self._size(key, old)
+        shard.items[key] = item
+        shard.bytes += self._size(key, item)
+        while len(shard.items) > self._max_entries or (shard.bytes > self._max_bytes and len(shard.items) > 1):
+            old_key, old_item = shard.items.popitem(last=False)
+            shard.bytes -= self._size(old_key, old_item)
+            self.evictions += 1
+
+    async def sweep(self, now: float | None = None) -> int:
+        now = now if now is not None else _now()
+        removed = 0
+        for shard in self._shards:
+            async with shard.lock:
+                dead = [k for k, item in shard.items.items() if item.expires_at <= now]
+                for k in dead:
+                    shard.bytes -= self._size(k, shard.items.pop(k))
+            removed += len(dead)
+            # let request handlers run between shards
+            await asyncio.sleep(0)
+        self.expired += removed
+        return removed
+
+    def __len__(self) -> int:
+        return sum(len(shard.items) for shard in self._shards)
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            shard.items.clear()
+            shard.bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self),
+            "bytes": sum(shard.bytes for shard in self._shards),
+            "in_flight": sum(len(shard.in_flight) for shard in self._shards),
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+        }
+
+
+_name_to_mbid = BoundedTTLCache("name_to_mbid")
+_mbid_to_name = BoundedTTLCache("mbid_to_name")
+
+# fresh MusicBrainz answers not yet written to the musicbrainz_cache table (L2)
+_pending_l2: dict[tuple[str, str], CacheItem] = {}
+
+_sweeper_task: asyncio.Task | None = None
 _rate_lock = asyncio.Lock()
 _last_req_ts = 0.0
+_mb_requests = 0
 
 POS_TTL_NAME_TO_MBID = 60 * 60 * 24 * 14
 NEG_TTL_NAME_TO_MBID = 60 * 60 * 24 * 1
@@ -50,6 +189,11 @@ def _now() -> float:
     return time.time()
 
 
+def _rate_limiter_idle() -> bool:
+    """True when a request made now would not wait on ``_rate_limit``."""
+    return not _rate_lock.locked() and _now() >= _last_req_ts + MB_MIN_INTERVAL_SEC
+
+
 def _normalize_key(s: str) -> str:
     return " ".join(s.lower().split()).strip()
 
@@ -65,7 +209,9 @@ async def _rate_limit():
 
 
 async def _mb_get(url: str, params: dict) -> dict:
+    global _mb_requests
     await _rate_limit()
+    _mb_requests += 1
     client = await _get_mb_client()
     try:
         r = await client.get(url, params=params)
@@ -78,19 +224,48 @@ async def _mb_get(url: str, params: dict) -> dict:
         r.raise_for_status()
         return r.json()
 
+def _local_mbid(name: str, score_threshold: int) -> tuple[bool, Optional[str]]:
+    """(answered, mbid) from the offline index; unanswered misses go on to the web service."""
+    local = get_local_index()
+    if local is None:
+        return False, None
+    mbid = local.lookup_mbid(name, score_threshold)
+    return mbid is not None or not MB_LOCAL_HTTP_FALLBACK, mbid
+
+
+def _local_canonical_name(mbid: str) -> tuple[bool, Optional[str]]:
+    local = get_local_index()
+    if local is None:
+        return False, None
+    name = local.canonical_name(mbid)
+    return name is not None or not MB_LOCAL_HTTP_FALLBACK, name
+
+
 async def fetch_mbid_cached(name: str, score_threshold: int = 85) -> Optional[str]:
+    answered, mbid = _local_mbid(name, score_threshold)
+    if answered:
+        return mbid
+    return await _fetch_mbid_remote(name, score_threshold)
+
+
+def _lucene_phrase(name: str) -> str:
+    return name.replace("\\", "\\\\").replace('"', '\\"')
+
+
+async def _fetch_mbid_remote(name: str, score_threshold: int) -> Optional[str]:
     key = _normalize_key(name)
     now = _now()
 
-    async with _cache_lock:
-        item = _name_to_mbid.get(key)
-        if item and item.expires_at > now:
+    in_flight = _name_to_mbid.in_flight(key)
+    async with _name_to_mbid.lock(key):
+        item = _name_to_mbid.get(key, now)
+        if item:
             return item.value
 
-        fut = _in_flight_name.get(key)
+        fut = in_flight.get(key)
         if fut is None:
             fut = asyncio.get_running_loop().create_future()
-            _in_flight_name[key] = fut
+            in_flight[key] = fut
             leader = True
         else:
             leader = False
@@ -99,47 +274,220 @@ async def fetch_mbid_cached(name: str, score_threshold: int = 85) -> Optional[st
         return await fut
 
     try:
-        data = await _mb_get(
-            f"{MB_BASE}/artist/",
-            {"query": f'artist:"{name}"', "fmt": "json"},
-        )
-
-        artists = data.get("artists", [])
-        mbid = None
-        if artists:
-            top = artists[0]
-            if top.get("score", 0) >= score_threshold:
-                mbid = top.get("id")
+        if MB_BATCH_MAX_NAMES > 1:
+            mbid = await _search_batcher.resolve(name, score_threshold)
+        else:
+            mbid = _UNRESOLVED
+        if mbid is _UNRESOLVED:
+            mbid = await _search_mbid(name, score_threshold)
 
         ttl = POS_TTL_NAME_TO_MBID if mbid else NEG_TTL_NAME_TO_MBID
-        async with _cache_lock:
-            _name_to_mbid[key] = CacheItem(mbid, now + ttl)
-            fut = _in_flight_name.pop(key)
+        async with _name_to_mbid.lock(key):
+            item = CacheItem(mbid, now + ttl)
+            _name_to_mbid.set(key, item)
+            _queue_l2("name", key, item)
+            fut = in_flight.pop(key)
             fut.set_result(mbid)
 
         return mbid
     except Exception:
-        async with _cache_lock:
-            fut = _in_flight_name.pop(key)
+        async with _name_to_mbid.lock(key):
+            fut = in_flight.pop(key)
             fut.set_result(None)
-            _name_to_mbid[key] = CacheItem(None, now + NEG_TTL_NAME_TO_MBID)
+            _name_to_mbid.set(key, CacheItem(None, now + NEG_TTL_NAME_TO_MBID))
         return None
 
 
 
+async def _search_mbid(name: str, score_threshold: int) -> Optional[str]:
+    """One ``artist:"name"`` query; the top hit wins if its score clears the threshold."""
+    data = await _mb_get(
+        f"{MB_BASE}/artist/",
+        {"query": f'artist:"{_lucene_phrase(name)}"', "fmt": "json"},
+    )
+
+    artists = data.get("artists", [])
+    mbid = None
+    if artists:
+        top = artists[0]
+        if top.get("score", 0) >= score_threshold:
+            mbid = top.get("id")
+    return mbid
+
+
+# how long the first queued name waits for company before its batch is sent; a lone
+# name goes straight out when the rate limiter is idle
+MB_BATCH_WINDOW_MS = float(os.getenv("MB_BATCH_WINDOW_MS", "50"))
+# names per OR'd search; 1 or less bypasses the batcher and its window entirely
+MB_BATCH_MAX_NAMES = int(os.getenv("MB_BATCH_MAX_NAMES", "20"))
+MB_SEARCH_LIMIT = 100
+
+_UNRESOLVED = object()
+_RE_NAME_TOKEN = re.compile(r"\w+")
+
+
+def _name_tokens(normalized: str) -> frozenset[str]:
+    return frozenset(_RE_NAME_TOKEN.findall(normalized))
+
+
+def _artist_labels(artist: dict) -> set[str]:
+    """Normalized name, sort name and aliases of a search hit."""
+    labels = [artist.get("name"), artist.get("sort-name")]
+    for alias in artist.get("aliases") or []:
+        labels += [alias.get("name"), alias.get("sort-name")]
+    return {normalize_mb_name(label) for label in labels if label}
+
+
+class _BatchResult:
+    """Answers per-name questions about one OR'd search response.
+
+    MusicBrainz normalizes scores so the top hit of the whole query gets 100;
+    a name's own hits can score far lower when another phrase in the batch
+    matched better. Scores are therefore rescaled per name, against the best
+    hit that contains all of that name's tokens, i.e. the hit its own
+    single-name query would have ranked first.
+    """
+
+    def __init__(self, data: dict) -> None:
+        artists = [a for a in data.get("artists", []) if a.get("id")]
+        self.hits = []
+        for artist in artists:
+            labels = _artist_labels(artist)
+            self.hits.append((artist.get("score", 0), artist["id"], labels, [_name_tokens(l) for l in labels]))
+        # with more matches than the page holds, a name's hits may have been cut off
+        self.complete = data.get("count", len(artists)) <= len(artists) and not data.get("offset")
+
+    def resolve(self, name: str, score_threshold: int):
+        """The mbid, None when the name clearly has no match, or _UNRESOLVED when only a single-name query can tell."""
+        norm = normalize_mb_name(name)
+        tokens = _name_tokens(norm)
+        # a phrase query only matches labels containing all of its tokens; order is ignored
+        # here, which errs towards treating a hit as the name's own
+        own = [(score, mbid, labels) for score, mbid, labels, label_tokens in self.hits if any(tokens <= t for t in label_tokens)]
+        if not own:
+            return None if self.complete else _UNRESOLVED
+        top = max(score for score, _, _ in own)
+        # hits come best-first, so on equal scores the earlier artist stays
+        exact = max(((score, mbid) for score, mbid, labels in own if norm in labels), key=lambda x: x[0], default=None)
+        if exact is not None and top > 0 and 100 * exact[0] / top >= score_threshold:
+            return exact[1]
+        # a partial match would be the single query's top hit; leave that call to it
+        return _UNRESOLVED
+
+
+class _SearchBatcher:
+    """Collects concurrent name lookups and resolves up to MB_BATCH_MAX_NAMES of them per OR'd search.
+
+    In a batch, ``score_threshold`` applies to the per-name rescaled score (see
+    ``_BatchResult``) of a hit carrying the name exactly as name, sort name or
+    alias. A name whose tokens never all occur in one hit of a complete
+    response resolves to None, as its own query would have. Everything else
+    gets ``_UNRESOLVED`` and the caller falls back to a single-name query.
+    Names queued while a batch waits on the rate limiter go out together in
+    the next one.
+    """
+
+    def __init__(self) -> None:
+        self._pending: list[tuple[str, int, asyncio.Future]] = []
+        self._task: asyncio.Task | None = None
+        self.batches = 0
+        self.names = 0
+        self.matched = 0
+        self.missing = 0
+        self.fallbacks = 0
+
+    async def resolve(self, name: str, score_threshold: int):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._pending.append((name, score_threshold, fut))
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return await fut
+
+    async def _run(self) -> None:
+        while self._pending:
+            # waiting only pays off if more names can still join the request
+            if len(self._pending) > 1 or not _rate_limiter_idle():
+                await asyncio.sleep(MB_BATCH_WINDOW_MS / 1000)
+            batch = self._pending[:MB_BATCH_MAX_NAMES]
+            del self._pending[:MB_BATCH_MAX_NAMES]
+            try:
+                await self._search(batch)
+            finally:
+                for _, _, fut in batch:
+                    if not fut.done():
+                        fut.set_result(_UNRESOLVED)
+
+    async def _search(self, batch: list[tuple[str, int, asyncio.Future]]) -> None:
+        if len(batch) == 1:
+            # nothing to share the request with: same query and rule as an unbatched lookup
+            name, score_threshold, fut = batch[0]
+            try:
+                mbid = await _search_mbid(name, score_threshold)
+            except Exception:
+                return
+            if not fut.done():
+                fut.set_result(mbid)
+            return
+
+        names = list(dict.fromkeys(name for name, _, _ in batch))
+        query = " OR ".join(f'artist:"{_lucene_phrase(name)}"' for name in names)
+        try:
+            data = await _mb_get(f"{MB_BASE}/artist/", {"query": query, "limit": MB_SEARCH_LIMIT, "fmt": "json"})
+        except Exception:
+            return
+        self.batches += 1
+        self.names += len(batch)
+
+        result = _BatchResult(data)
+        for name, score_threshold, fut in batch:
+            mbid = result.resolve(name, score_threshold)
+            if fut.done():
+                continue
+            if mbid is _UNRESOLVED:
+                self.fallbacks += 1
+                continue
+            fut.set_result(mbid)
+            if mbid is None:
+                self.missing += 1
+            else:
+                self.matched += 1
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "names": self.names,
+            "matched": self.matched,
+            "missing": self.missing,
+            "fallbacks": self.fallbacks,
+            "queued": len(self._pending),
+        }
+
+
+_search_batcher = _SearchBatcher()
+
+
 async def fetch_deduped_name_cached(mbid: str) -> Optional[str]:
+    answered, name = _local_canonical_name(mbid)
+    if answered:
+        return name
+    return await _fetch_canonical_name_remote(mbid)
+
+
+async def _fetch_canonical_name_remote(mbid: str) -> Optional[str]:
     key = mbid.strip()
     now = _now()
 
-    async with _cache_lock:
-        item = _mbid_to_name.get(key)
-        if item and item.expires_at > now:
+    in_flight = _mbid_to_name.in_flight(key)
+    async with _mbid_to_name.lock(key):
+        item = _mbid_to_name.get(key, now)
+        if item:
             return item.value
 
-        fut = _in_flight_mbid.get(key)
+        fut = in_flight.get(key)
         if fut is None:
             fut = asyncio.get_running_loop().create_future()
-            _in_flight_mbid[key] = fut
+            in_flight[key] = fut
             leader = True
         else:
             leader = False
@@ -156,15 +504,195 @@ async def fetch_deduped_name_cached(mbid: str) -> Optional[str]:
         canon = data.get("name")
         ttl = POS_TTL_MBID_TO_NAME if canon else NEG_TTL_MBID_TO_NAME
 
-        async with _cache_lock:
-            _mbid_to_name[key] = CacheItem(canon, now + ttl)
-            fut = _in_flight_mbid.pop(key)
+        async with _mbid_to_name.lock(key):
+            item = CacheItem(canon, now + ttl)
+            _mbid_to_name.set(key, item)
+            _queue_l2("mbid", key, item)
+            fut = in_flight.pop(key)
             fut.set_result(canon)
 
         return canon
     except Exception:
-        async with _cache_lock:
-            fut = _in_flight_mbid.pop(key)
+        async with _mbid_to_name.lock(key):
+            fut = in_flight.pop(key)
             fut.set_result(None)
-            _mbid_to_name[key] = CacheItem(None, now + NEG_TTL_MBID_TO_NAME)
+            _mbid_to_name.set(key, CacheItem(None, now + NEG_TTL_MBID_TO_NAME))
         return None
+
+
+_L2_CHUNK = 1000
+
+
+def _l1(kind: str) -> BoundedTTLCache:
+    return _name_to_mbid if kind == "name" else _mbid_to_name
+
+
+def _queue_l2(kind: str, key: str, item: CacheItem) -> None:
+    _pending_l2.pop((kind, key), None)
+    _pending_l2[(kind, key)] = item
+    while len(_pending_l2) > MB_PENDING_L2_MAX:
+        del _pending_l2[next(iter(_pending_l2))]
+
+
+async def prefetch_l2(db: AsyncSession, kind: str, keys: list[str]) -> int:
+    """Load unexpired musicbrainz_cache rows for ``keys`` missing from L1; returns how many were found."""
+    now = _now()
+    cache = _l1(kind)
+    missing = [k for k in dict.fromkeys(keys) if cache.peek(k, now) is None]
+    found = 0
+    for i in range(0, len(missing), _L2_CHUNK):
+        stmt = (
+            select(MusicBrainzCacheEntry.key, MusicBrainzCacheEntry.value, MusicBrainzCacheEntry.expires_at)
+            .where(MusicBrainzCacheEntry.kind == kind)
+            .where(MusicBrainzCacheEntry.key.in_(missing[i : i + _L2_CHUNK]))
+            .where(MusicBrainzCacheEntry.expires_at > datetime.fromtimestamp(now, timezone.utc))
+        )
+        rows = (await db.execute(stmt)).all()
+        for key, value, expires_at in rows:
+            cache.set(key, CacheItem(value, expires_at.timestamp()))
+        found += len(rows)
+    return found
+
+
+async def flush_l2() -> int:
+    """Upsert answers fetched since the last flush into musicbrainz_cache; returns how many were written.
+
+    Runs on its own session so a failed write never touches the caller's
+    transaction; on failure the entries go back into the buffer for the next flush.
+    """
+    global _pending_l2
+    if not _pending_l2:
+        return 0
+    pending, _pending_l2 = _pending_l2, {}
+
+    rows = [
+        {
+            "kind": kind,
+            "key": key,
+            "value": item.value,
+            "expires_at": datetime.fromtimestamp(item.expires_at, timezone.utc),
+        }
+        for (kind, key), item in pending.items()
+    ]
+    try:
+        # imported here so the lookups work without DATABASE_URL (scripts, L1-only use)
+        from app.db import SessionLocal
+
+        async with SessionLocal() as db:
+            for i in range(0, len(rows), _L2_CHUNK):
+                stmt = insert(MusicBrainzCacheEntry).values(rows[i : i + _L2_CHUNK])
+                stmt = stmt.on_conflict_do_update(
+                    constraint="uq_musicbrainz_cache_kind_key",
+                    set_={"value": stmt.excluded.value, "expires_at": stmt.excluded.expires_at, "updated_at": datetime.now(timezone.utc)},
+                )
+                await db.execute(stmt)
+            await db.commit()
+    except Exception:
+        logger.exception("musicbrainz_cache flush of %d entries failed; re-queued", len(rows))
+        # answers fetched meanwhile are newer and win
+        _pending_l2 = {**pending, **_pending_l2}
+        while len(_pending_l2) > MB_PENDING_L2_MAX:
+            del _pending_l2[next(iter(_pending_l2))]
+        return 0
+    return len(rows)
+
+
+async def fetch_mbids_cached(
+    names: list[str],
+    score_threshold: int = 85,
+    db: AsyncSession | None = None,
+) -> dict[str, Optional[str]]:
+    """name -> mbid for every name, looking each normalized name up once and all of them concurrently.
+
+    Cache hits return immediately; misses still queue on ``_rate_limit`` in request order.
+    With ``db`` the shared musicbrainz_cache table is read on that session first; new answers are
+    written back on a separate one, so the caller's transaction is never committed here.
+    """
+    by_key: dict[str, str] = {}
+    for name in names:
+        if name and name.strip():
+            by_key.setdefault(_normalize_key(name), name)
+
+    resolved: dict[str, Optional[str]] = {}
+    for key, name in by_key.items():
+        answered, mbid = _local_mbid(name, score_threshold)
+        if answered:
+            resolved[key] = mbid
+
+    keys = [key for key in by_key if key not in resolved]
+    if db is not None and keys:
+        await prefetch_l2(db, "name", keys)
+    mbids = await asyncio.gather(*(_fetch_mbid_remote(by_key[key], score_threshold) for key in keys))
+    if db is not None:
+        await flush_l2()
+    resolved.update(zip(keys, mbids))
+    return {name: resolved.get(_normalize_key(name)) if name else None for name in names}
+
+
+async def fetch_deduped_names_cached(mbids: list[str], db: AsyncSession | None = None) -> dict[str, Optional[str]]:
+    resolved: dict[str, Optional[str]] = {}
+    for mbid in dict.fromkeys(m for m in mbids if m):
+        answered, name = _local_canonical_name(mbid)
+        if answered:
+            resolved[mbid] = name
+
+    unique = [m for m in dict.fromkeys(m for m in mbids if m) if m not in resolved]
+    if db is not None and unique:
+        await prefetch_l2(db, "mbid", [m.strip() for m in unique])
+    names = await asyncio.gather(*(_fetch_canonical_name_remote(mbid) for mbid in unique))
+    if db is not None:
+        await flush_l2()
+    resolved.update(zip(unique, names))
+    return resolved
+
+
+async def warm_musicbrainz_cache(db: AsyncSession, batch_size: int = 50, limit: int | None = None) -> dict:
+    """Resolve every ArtistNameVariant canonical name (and its mbid's canonical name) into the shared cache."""
+    stmt = select(ArtistNameVariant.canonical_name).distinct().order_by(ArtistNameVariant.canonical_name)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    names = list((await db.execute(stmt)).scalars())
+
+    requests_before = _mb_requests
+    resolved = 0
+    for i in range(0, len(names), batch_size):
+        mbids = await fetch_mbids_cached(names[i : i + batch_size], db=db)
+        await fetch_deduped_names_cached(list(mbids.values()), db=db)
+        resolved += sum(1 for mbid in mbids.values() if mbid)
+    return {"names": len(names), "resolved": resolved, "mb_requests": _mb_requests - requests_before}
+
+
+def cache_stats() -> dict:
+    local = get_local_index()
+    return {
+        "name_to_mbid": _name_to_mbid.stats(),
+        "mbid_to_name": _mbid_to_name.stats(),
+        "pending_l2": len(_pending_l2),
+        "mb_requests": _mb_requests,
+        "search_batches": _search_batcher.stats(),
+        "local_index": local.stats() if local is not None else None,
+    }
+
+
+async def _sweep_loop() -> None:
+    while True:
+        await asyncio.sleep(MB_CACHE_SWEEP_SEC)
+        for cache in (_name_to_mbid, _mbid_to_name):
+            await cache.sweep()
+
+
+def start_cache_sweeper() -> None:
+    global _sweeper_task
+    if _sweeper_task is None or _sweeper_task.done():
+        _sweeper_task = asyncio.get_running_loop().create_task(_sweep_loop())
+
+
+async def stop_cache_sweeper() -> None:
+    global _sweeper_task
+    if _sweeper_task is not None:
+        _sweeper_task.cancel()
+        try:
+            await _sweeper_task
+        except asyncio.CancelledError:
+            pass
+        _sweeper_task = None
@@ -0,0 +1,170 @@
+import os
+import sqlite3
+import tarfile
+import threading
+import time
+import unicodedata
+from typing import Iterator, Optional
+
+MB_LOCAL_INDEX_PATH = os.getenv("MB_LOCAL_INDEX_PATH")
+# ask the web service when the local index has no match above the threshold
+MB_LOCAL_HTTP_FALLBACK = os.getenv("MB_LOCAL_HTTP_FALLBACK", "1") == "1"
+MB_DUMP_SAMPLE = os.path.join(os.path.dirname(__file__), "mbdump_sample")
+
+# search-score stand-ins: the artist's own name outranks an alias or sort name
+SCORE_NAME = 100
+SCORE_ALIAS = 90
+SCORE_SORT_NAME = 90
+
+_COPY_UNESCAPE = {"t": "\t", "n": "\n", "r": "\r", "\\": "\\", "b": "\b", "f": "\f", "v": "\v"}
+
+
+def normalize_mb_name(name: str) -> str:
+    """Case-, whitespace- and diacritic-insensitive key, like the search server's artist field."""
+    decomposed = unicodedata.normalize("NFKD", name)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(stripped.casefold().split())
+
+
+def _parse_copy_line(line: str) -> list[Optional[str]]:
+    fields = []
+    for raw in line.rstrip("\n").split("\t"):
+        if raw == "\\N":
+            fields.append(None)
+        elif "\\" in raw:
+            out, i = [], 0
+            while i < len(raw):
+                if raw[i] == "\\" and i + 1 < len(raw):
+                    out.append(_COPY_UNESCAPE.get(raw[i + 1], raw[i + 1]))
+                    i += 2
+                else:
+                    out.append(raw[i])
+                    i += 1
+            fields.append("".join(out))
+        else:
+            fields.append(raw)
+    return fields
+
+
+def iter_dump_tables(source: str, tables: tuple[str, ...] = ("artist", "artist_alias")) -> Iterator[tuple[str, list]]:
+    """(table, row) from an mbdump.tar.bz2 (read in one streaming pass) or a directory of COPY files."""
+    if os.path.isdir(source):
+        for table in tables:
+            path = os.path.join(source, table)
+            if not os.path.exists(path):
+                path = os.path.join(source, "mbdump", table)
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    yield table, _parse_copy_line(line)
+        return
+
+    with tarfile.open(source, "r|*") as tar:
+        for member in tar:
+            table = os.path.basename(member.name)
+            if not member.isfile() or table not in tables or os.path.dirname(member.name) != "mbdump":
+                continue
+            f = tar.extractfile(member)
+            for raw in f:
+                yield table, _parse_copy_line(raw.decode("utf-8"))
+
+
+_SCHEMA = """
+CREATE TABLE artist (id INTEGER PRIMARY KEY, mbid TEXT NOT NULL, name TEXT NOT NULL);
+CREATE TABLE artist_name (norm TEXT NOT NULL, artist_id INTEGER NOT NULL, score INTEGER NOT NULL);
+"""
+_INDEXES = """
+CREATE UNIQUE INDEX ix_artist_mbid ON artist (mbid);
+CREATE INDEX ix_artist_name_norm ON artist_name (norm, score DESC, artist_id);
+"""
+
+
+def build_local_index(source: str, out_path: str, batch_size: int = 50_000) -> dict:
+    """Load MusicBrainz artist + artist_alias rows into a SQLite file at ``out_path`` (replaced atomically)."""
+    tmp_path = out_path + ".tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    conn.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF;" + _SCHEMA)
+
+    stats = {"artists": 0, "aliases": 0, "names": 0}
+    artists, names = [], []
+
+    def flush() -> None:
+        conn.executemany("INSERT INTO artist VALUES (?, ?, ?)", artists)
+        conn.executemany("INSERT INTO artist_name VALUES (?, ?, ?)", names)
+        stats["names"] += len(names)
+        artists.clear()
+        names.clear()
+
+    t0 = time.perf_counter()
+    for table, row in iter_dump_tables(source):
+        if table == "artist":
+            # id, gid, name, sort_name, ...
+            artist_id, mbid, name, sort_name = int(row[0]), row[1], row[2], row[3]
+            artists.append((artist_id, mbid, name))
+            norm = normalize_mb_name(name)
+            names.append((norm, artist_id, SCORE_NAME))
+            if sort_name and normalize_mb_name(sort_name) != norm:
+                names.append((normalize_mb_name(sort_name), artist_id, SCORE_SORT_NAME))
+            stats["artists"] += 1
+        else:
+            # id, artist, name, locale, edits_pending, last_updated, type, sort_name, ...
+            names.append((normalize_mb_name(row[2]), int(row[1]), SCORE_ALIAS))
+            stats["aliases"] += 1
+        if len(names) >= batch_size:
+            flush()
+    flush()
+    conn.executescript(_INDEXES)
+    conn.commit()
+    conn.close()
+    os.replace(tmp_path, out_path)
+
+    stats["elapsed_s"] = round(time.perf_counter() - t0, 2)
+    return stats
+
+
+class LocalArtistIndex:
+    """Read-only name->mbid / mbid->name lookups over a file built by ``build_local_index``."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup_mbid(self, name: str, score_threshold: int = 85) -> Optional[str]:
+        """Best-scoring artist for ``name``; among equal scores the oldest (lowest id) artist wins."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT a.mbid, n.score FROM artist_name n JOIN artist a ON a.id = n.artist_id"
+                " WHERE n.norm = ? ORDER BY n.score DESC, n.artist_id LIMIT 1",
+                (normalize_mb_name(name),),
+            ).fetchone()
+        if row is None or row[1] < score_threshold:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def canonical_name(self, mbid: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT name FROM artist WHERE mbid = ?", (mbid.strip(),)).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return row[0]
+
+    def stats(self) -> dict:
+        return {"path": self.path, "hits": self.hits, "misses": self.misses}
+
+
+_local_index: LocalArtistIndex | None = None
+
+
+def get_local_index() -> LocalArtistIndex | None:
+    global _local_index
+    if _local_index is None and MB_LOCAL_INDEX_PATH and os.path.exists(MB_LOCAL_INDEX_PATH):
+        _local_index = LocalArtistIndex(MB_LOCAL_INDEX_PATH)
+    return _local_index
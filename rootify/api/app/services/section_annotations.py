@@ -0,0 +1,68 @@
+import logging
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.compute import run_nlp
+from app.models import SectionAnnotation
+from app.pipeline.nlp import annotation_model_version
+from app.pipeline.nlp_annotations import annotate_texts, text_hash
+
+logger = logging.getLogger(__name__)
+
+# rows per statement: asyncpg allows 32767 bind parameters per query
+_ANNOTATION_CHUNK = 1000
+
+
+async def load_annotations(db: AsyncSession, keys: list[str], model_version: str) -> dict[str, dict]:
+    found = {}
+    for i in range(0, len(keys), _ANNOTATION_CHUNK):
+        stmt = (
+            select(SectionAnnotation.text_hash, SectionAnnotation.annotations)
+            .where(SectionAnnotation.model_version == model_version)
+            .where(SectionAnnotation.text_hash.in_(keys[i : i + _ANNOTATION_CHUNK]))
+        )
+        found.update((await db.execute(stmt)).all())
+    return found
+
+
+async def store_annotations(annotations: dict[str, dict], model_version: str) -> None:
+    """Insert freshly parsed annotations on a session of their own.
+
+    The rows are a cache: a failed write is logged and the texts are simply
+    parsed again next time, without touching the caller's transaction.
+    """
+    if not annotations:
+        return
+    rows = [
+        {"text_hash": key, "model_version": model_version, "annotations": value}
+        for key, value in annotations.items()
+    ]
+    try:
+        # imported here: the rules also run in scripts and workers without DATABASE_URL
+        from app.db import SessionLocal
+
+        async with SessionLocal() as db:
+            for i in range(0, len(rows), _ANNOTATION_CHUNK):
+                stmt = insert(SectionAnnotation).values(rows[i : i + _ANNOTATION_CHUNK])
+                # concurrent extractions of the same text produce identical rows; first writer wins
+                await db.execute(stmt.on_conflict_do_nothing(constraint="uq_section_annotations_text_hash_model_version"))
+            await db.commit()
+    except Exception:
+        logger.exception("storing %d section annotations failed", len(annotations))
+
+
+async def get_or_create_annotations(db: AsyncSession, texts: list[str], profile: str) -> dict[str, dict]:
+    """Stored annotations for ``texts`` keyed by text_hash; anything missing is parsed on the nlp pool and stored."""
+    model_version = annotation_model_version(profile)
+    by_key = {text_hash(t): t for t in texts}
+    found = await load_annotations(db, list(by_key), model_version)
+
+    missing = [key for key in by_key if key not in found]
+    if missing:
+        parsed = await run_nlp(annotate_texts, [by_key[key] for key in missing], profile)
+        new = dict(zip(missing, parsed))
+        await store_annotations(new, model_version)
+        found.update(new)
+    return found